@@ -6,19 +6,42 @@ cron: 0 9 * * *
 """
 
 import asyncio
+import json
+import os
 import re
 import time
 import random
-from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple, Dict
+from typing import Awaitable, Callable, List, Optional, Tuple, Dict
 import utils.pyEnv as env
-from openai import OpenAI
-import aiohttp
-import requests
+from utils.store import DiskCache, SummaryCache
+from utils.http import (
+    AdaptiveRateLimiter,
+    AsyncHttpClient,
+    HttpClient,
+    HttpPolicy,
+    RatePreset,
+    ValidatorCache,
+)
+from utils.ai import TokenBucket, async_openai_client, chat_completion
+from openai import AsyncOpenAI, OpenAI
+import httpx
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 from loguru import logger
+
+# 可选的 C 实现 HTML 解析器（未安装时降级到 html.parser）
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
 # 导入配置
 AI_API_KEY = env.get_env("AI_API_KEY")[0]
 AI_BASE_URL = env.get_env("AI_BASE_URL")[0]
@@ -42,6 +65,16 @@ AIBASE_ARTICLE_PATTERNS = [
     re.compile(r"/zh/news/detail/(\d+)\.html"),
 ]
 
+# 文章页英文日期匹配规则（日期节点缺失时的兜底）
+ENGLISH_DATE_PATTERN = re.compile(r"([A-Za-z]{3}\s+\d{1,2},\s+\d{4})")
+
+# 列表页发布时间匹配规则（相对时间 / 中英文日期）
+RELATIVE_TIME_PATTERN = re.compile(r"(\d+)\s*(秒|分钟|小时|天)前")
+LIST_DATE_PATTERN = re.compile(
+    r"\d{4}年\d{1,2}月\d{1,2}日|[A-Za-z]{3}\s+\d{1,2},\s+\d{4}"
+)
+LIST_CLOCK_PATTERN = re.compile(r"\d{1,2}:\d{2}")
+
 
 @dataclass
 class Article:
@@ -54,6 +87,39 @@ class Article:
     content: str  # 文章正文（用于 AI 总结）
 
 
+def _article_to_dict(article: Optional[Article]) -> Optional[dict]:
+    """文章序列化（用于持久化缓存）"""
+    if article is None:
+        return None
+    return {**asdict(article), "published_at": article.published_at.isoformat()}
+
+
+def _article_from_dict(data: Optional[dict]) -> Optional[Article]:
+    """文章反序列化"""
+    if data is None:
+        return None
+    return Article(**{**data, "published_at": datetime.fromisoformat(data["published_at"])})
+
+
+def _get_cached_article(article_id: int) -> Tuple[bool, Optional[Article]]:
+    """读取持久化文章缓存，返回 (是否命中, 文章)；命中的 None 表示已知无效文章"""
+    try:
+        hit, data = article_disk_cache.get(str(article_id))
+        return hit, _article_from_dict(data) if hit else None
+    except Exception as e:
+        logger.warning(f"读取文章缓存失败：ID={article_id}, 错误={str(e)[:50]}")
+        return False, None
+
+
+def _set_cached_article(article_id: int, article: Optional[Article]) -> None:
+    """写入持久化文章缓存（有效文章与无效文章使用不同的过期时间）"""
+    ttl = ARTICLE_CACHE_HIT_TTL if article else ARTICLE_CACHE_MISS_TTL
+    try:
+        article_disk_cache.set(str(article_id), _article_to_dict(article), ttl)
+    except Exception as e:
+        logger.warning(f"写入文章缓存失败：ID={article_id}, 错误={str(e)[:50]}")
+
+
 def _get_common_headers() -> Dict[str, str]:
     """获取通用请求头"""
     ua = UserAgent()
@@ -112,38 +178,113 @@ def _deduplicate_and_sort_articles(
     return sorted_articles[:max_articles]
 
 
+# 正文中不属于可见文本的节点，各解析后端提取正文前统一移除，保证输出一致
+NON_TEXT_TAGS = ("script", "style", "noscript", "template")
+
+
+def _extract_fields_bs4(html: str) -> Tuple[str, str, str]:
+    """html.parser 后端（纯 Python，兜底）：返回 (标题, 日期文本, 正文)"""
+    soup = BeautifulSoup(html, "html.parser")
+    title_elem = soup.find("h1")
+    date_elem = soup.find("div", class_="text-surface-500")
+    content_elem = soup.find("div", class_="post-content")
+    if content_elem:
+        for node in content_elem.find_all(NON_TEXT_TAGS):
+            node.decompose()
+    return (
+        title_elem.get_text() if title_elem else "",
+        date_elem.get_text() if date_elem else "",
+        content_elem.get_text() if content_elem else "",
+    )
+
+
+def _xpath_class(tag: str, class_name: str) -> str:
+    return (
+        f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+    )
+
+
+if lxml_html is not None:
+    # 预编译选择器，避免每篇文章重复解析表达式
+    _LXML_TITLE = etree.XPath("(//h1)[1]")
+    _LXML_DATE = etree.XPath(f"({_xpath_class('div', 'text-surface-500')})[1]")
+    _LXML_CONTENT = etree.XPath(f"({_xpath_class('div', 'post-content')})[1]")
+    _LXML_NON_TEXT = etree.XPath(" | ".join(f".//{tag}" for tag in NON_TEXT_TAGS))
+
+
+def _extract_fields_lxml(html: str) -> Tuple[str, str, str]:
+    """lxml 后端（C 实现）：返回 (标题, 日期文本, 正文)"""
+    tree = lxml_html.fromstring(html)
+
+    def text_of(xpath) -> str:
+        nodes = xpath(tree)
+        return nodes[0].text_content() if nodes else ""
+
+    content_nodes = _LXML_CONTENT(tree)
+    if content_nodes:
+        for node in _LXML_NON_TEXT(content_nodes[0]):
+            node.drop_tree()  # 保留节点后的 tail 文本
+    return text_of(_LXML_TITLE), text_of(_LXML_DATE), text_of(_LXML_CONTENT)
+
+
+def _extract_fields_selectolax(html: str) -> Tuple[str, str, str]:
+    """selectolax 后端（C 实现，最快）：返回 (标题, 日期文本, 正文)"""
+    tree = LexborHTMLParser(html)
+
+    def text_of(selector: str) -> str:
+        node = tree.css_first(selector)
+        return node.text() if node else ""
+
+    content_node = tree.css_first("div.post-content")
+    if content_node:
+        content_node.strip_tags(list(NON_TEXT_TAGS))
+    return text_of("h1"), text_of("div.text-surface-500"), text_of("div.post-content")
+
+
+PARSER_BACKENDS = {
+    "selectolax": (_extract_fields_selectolax, LexborHTMLParser is not None),
+    "lxml": (_extract_fields_lxml, lxml_html is not None),
+    "html.parser": (_extract_fields_bs4, True),
+}
+
+
+def _get_parser_backend() -> str:
+    """选择解析后端：优先使用配置项，未安装时按 selectolax → lxml → html.parser 降级"""
+    if PARSER_BACKENDS.get(HTML_PARSER_BACKEND, (None, False))[1]:
+        return HTML_PARSER_BACKEND
+    return next(name for name, (_, available) in PARSER_BACKENDS.items() if available)
+
+
 def _parse_article_html(
     html: str, article_id: int, article_url: str
 ) -> Optional[Article]:
-    """解析文章HTML的通用逻辑"""
+    """解析文章HTML的通用逻辑（只提取标题、日期、正文三个节点）"""
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        backend = _get_parser_backend()
+        try:
+            title, date_text, content = PARSER_BACKENDS[backend][0](html)
+        except Exception as e:
+            logger.warning(f"{backend} 解析失败，改用 html.parser：ID={article_id}, 错误={str(e)[:50]}")
+            title, date_text, content = _extract_fields_bs4(html)
 
         # 提取标题
-        title_elem = soup.find("h1")
-        title = title_elem.get_text().strip() if title_elem else ""
+        title = title.strip()
         if not title:
             logger.warning(f"解析失败：文章 ID={article_id} 无标题")
             return None
 
-        # 提取发布时间
-        date_text = ""
-        date_match = re.search(r"([A-Za-z]{3}\s+\d{1,2},\s+\d{4})", html)
-        if date_match:
-            date_text = date_match.group(1)
-        else:
-            date_elem = soup.find("div", class_="text-surface-500")
-            if date_elem:
-                date_text = date_elem.get_text().strip()
-
-        pub_dt = parse_chinese_datetime(date_text)
+        # 提取发布时间（优先日期节点，缺失时再对全文做正则匹配）
+        pub_dt = parse_chinese_datetime(date_text.strip())
+        if not pub_dt:
+            date_match = ENGLISH_DATE_PATTERN.search(html)
+            if date_match:
+                pub_dt = parse_chinese_datetime(date_match.group(1))
         if not pub_dt:
             logger.warning(f"解析失败：文章 ID={article_id} 无法获取发布时间")
             return None
 
         # 提取正文
-        content_elem = soup.find("div", class_="post-content")
-        content = content_elem.get_text().strip() if content_elem else ""
+        content = content.strip()
         content = re.sub(r"\n{3,}", "\n\n", content)
         content = re.sub(r"\s+", " ", content)
 
@@ -163,50 +304,81 @@ def _parse_article_html(
         return None
 
 
-async def safe_get_async(
-    url: str, session: aiohttp.ClientSession, timeout: int = 15
-) -> Optional[str]:
-    """异步安全 HTTP GET 请求（模拟浏览器，避免反爬，核心爬取工具）"""
-    headers = _get_common_headers()
+def _get_parse_executor() -> Executor:
+    """获取解析池：html.parser 为纯 Python 解析，使用进程池绕开 GIL；C 解析器使用线程池"""
+    global _parse_executor
+    if _parse_executor is None:
+        use_process = PARSE_EXECUTOR == "process" or (
+            PARSE_EXECUTOR == "auto" and _get_parser_backend() == "html.parser"
+        )
+        executor_cls = ProcessPoolExecutor if use_process else ThreadPoolExecutor
+        _parse_executor = executor_cls(max_workers=PARSE_WORKERS)
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    """关闭解析池"""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
 
+async def _parse_article_async(
+    html: str, article_id: int, article_url: str
+) -> Optional[Article]:
+    """在解析池中解析文章，积压的待解析页面数受 PARSE_QUEUE_SIZE 限制（背压抓取阶段）"""
+    async with _parse_slots:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                _get_parse_executor(), _parse_article_html, html, article_id, article_url
+            )
+        except Exception as e:
+            logger.error(f"解析池执行失败：ID={article_id}, 错误={str(e)[:50]}")
+            return None
+
+
+async def fetch_page_async(
+    url: str, http: AsyncHttpClient
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    异步 HTTP GET 请求（模拟浏览器，避免反爬，核心爬取工具；条件请求与限速由客户端处理）
+    返回 (状态码, 页面)：网络异常时状态码为 None，非 200 时页面为 None
+    """
     try:
-        async with session.get(url, headers=headers, timeout=timeout) as resp:
-            if resp.status != 200:
-                logger.warning(f"请求失败：{url}, 状态码 {resp.status}")
-                return None
-            text = await resp.text()
-            return text
-    except asyncio.TimeoutError:
+        resp = await http.get(url, headers=_get_common_headers())
+    except httpx.TimeoutException:
         logger.warning(f"请求超时：{url}")
-        return None
-    except aiohttp.ClientError as e:
+        return None, None
+    except httpx.HTTPError as e:
         logger.error(f"网络错误：{url}, 错误={str(e)[:50]}")
-        return None
-    except Exception as e:
-        logger.error(f"未知错误：{url}, 错误={str(e)[:50]}")
-        return None
-
+        return None, None
+    if resp.status_code != 200:
+        logger.warning(f"请求失败：{url}, 状态码 {resp.status_code}")
+        return resp.status_code, None
+    return resp.status_code, resp.text
 
-def safe_get(url: str, timeout: int = 15) -> Optional[str]:
-    """同步安全 HTTP GET 请求（保持向后兼容）"""
-    headers = _get_common_headers()
 
+def fetch_page(url: str) -> Tuple[Optional[int], Optional[str]]:
+    """同步 HTTP GET 请求，返回值同 fetch_page_async"""
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        if resp.status_code != 200:
-            logger.warning(f"请求失败：{url}, 状态码 {resp.status_code}")
-            return None
-        resp.encoding = "utf-8"  # 强制 UTF-8 编码，避免中文乱码
-        return resp.text
-    except requests.Timeout:
+        resp = aibase_client.get(url, headers=_get_common_headers())
+    except httpx.TimeoutException:
         logger.warning(f"请求超时：{url}")
-        return None
-    except requests.RequestException as e:
+        return None, None
+    except httpx.HTTPError as e:
         logger.error(f"网络错误：{url}, 错误={str(e)[:50]}")
-        return None
-    except Exception as e:
-        logger.error(f"未知错误：{url}, 错误={str(e)[:50]}")
-        return None
+        return None, None
+    if resp.status_code != 200:
+        logger.warning(f"请求失败：{url}, 状态码 {resp.status_code}")
+        return resp.status_code, None
+    return resp.status_code, resp.text
+
+
+def safe_get(url: str) -> Optional[str]:
+    """同步安全 HTTP GET 请求（保持向后兼容），失败时返回 None"""
+    return fetch_page(url)[1]
 
 
 def parse_chinese_datetime(text: str) -> Optional[datetime]:
@@ -271,7 +443,7 @@ def parse_chinese_datetime(text: str) -> Optional[datetime]:
 
 
 async def fetch_single_article_async(
-    article_id: int, session: aiohttp.ClientSession
+    article_id: int, http: AsyncHttpClient
 ) -> Optional[Article]:
     """异步爬取单篇 AIBase 文章（核心爬取逻辑，含内容/标题/时间提取）"""
     # 检查缓存
@@ -280,23 +452,39 @@ async def fetch_single_article_async(
             logger.debug(f"从缓存获取文章：ID={article_id}")
             return _article_cache[article_id]
 
+    # 检查持久化缓存（跨运行复用）
+    hit, cached = _get_cached_article(article_id)
+    if hit:
+        logger.debug(f"从持久化缓存获取文章：ID={article_id}")
+        async with _cache_lock:
+            _article_cache[article_id] = cached
+        return cached
+
     article_url = f"https://www.aibase.com/zh/news/{article_id}"
     logger.info(f"正在爬取文章：ID={article_id} → {article_url}")
 
     # 获取文章页面 HTML
-    html = await safe_get_async(article_url, session)
+    status, html = await fetch_page_async(article_url, http)
+    if status in ARTICLE_GONE_STATUS:
+        # 文章已删除或 ID 不存在：按无效文章落盘，避免后续运行重复请求
+        logger.info(f"文章不存在：ID={article_id}（状态码 {status}）")
+        async with _cache_lock:
+            _article_cache[article_id] = None
+        _set_cached_article(article_id, None)
+        return None
     if not html:
         logger.warning(f"爬取失败：文章 ID={article_id} 页面为空")
         async with _cache_lock:
             _article_cache[article_id] = None
         return None
 
-    # 解析 HTML
-    result = _parse_article_html(html, article_id, article_url)
+    # 解析 HTML（交给解析池，不阻塞事件循环上的其他请求）
+    result = await _parse_article_async(html, article_id, article_url)
 
-    # 缓存结果
+    # 缓存结果（网络失败、超时与 5xx 不落盘，仅缓存解析结果与 404/410）
     async with _cache_lock:
         _article_cache[article_id] = result
+    _set_cached_article(article_id, result)
 
     return result
 
@@ -308,11 +496,23 @@ def fetch_single_article(article_id: int) -> Optional[Article]:
         logger.debug(f"从缓存获取文章：ID={article_id}")
         return _article_cache[article_id]
 
+    # 检查持久化缓存（跨运行复用）
+    hit, cached = _get_cached_article(article_id)
+    if hit:
+        logger.debug(f"从持久化缓存获取文章：ID={article_id}")
+        _article_cache[article_id] = cached
+        return cached
+
     article_url = f"https://www.aibase.com/zh/news/{article_id}"
     logger.info(f"正在爬取文章：ID={article_id} → {article_url}")
 
     # 获取文章页面 HTML
-    html = safe_get(article_url)
+    status, html = fetch_page(article_url)
+    if status in ARTICLE_GONE_STATUS:
+        logger.info(f"文章不存在：ID={article_id}（状态码 {status}）")
+        _article_cache[article_id] = None
+        _set_cached_article(article_id, None)
+        return None
     if not html:
         logger.warning(f"爬取失败：文章 ID={article_id} 页面为空")
         _article_cache[article_id] = None
@@ -321,8 +521,9 @@ def fetch_single_article(article_id: int) -> Optional[Article]:
     # 解析 HTML
     result = _parse_article_html(html, article_id, article_url)
 
-    # 缓存结果
+    # 缓存结果（网络失败、超时与 5xx 不落盘，仅缓存解析结果与 404/410）
     _article_cache[article_id] = result
+    _set_cached_article(article_id, result)
 
     return result
 
@@ -354,20 +555,69 @@ def discover_latest_article_id() -> Optional[int]:
     return latest_id
 
 
-async def _fetch_batch_async(
-    batch_ids: List[int], session: aiohttp.ClientSession
-) -> List[Article]:
-    """异步批量获取文章"""
-    max_concurrent = MAX_CONCURRENT_REQUESTS
-    semaphore = asyncio.Semaphore(max_concurrent)
+def parse_list_datetime(text: str) -> Optional[datetime]:
+    """
+    解析列表页中的发布时间（支持"3小时前"等相对时间及绝对日期），
+    结果只用于判断文章是否可能在时间窗口内，最终以文章页时间为准
+    """
+    relative = RELATIVE_TIME_PATTERN.search(text or "")
+    if relative:
+        amount, unit = int(relative.group(1)), relative.group(2)
+        delta = {
+            "秒": timedelta(seconds=amount),
+            "分钟": timedelta(minutes=amount),
+            "小时": timedelta(hours=amount),
+            "天": timedelta(days=amount),
+        }[unit]
+        return datetime.now(TZ_SG) - delta
+    if not LIST_DATE_PATTERN.search(text or ""):
+        return None
+    published_at = parse_chinese_datetime(text)
+    if published_at and not LIST_CLOCK_PATTERN.search(text):
+        # 只有日期时取当天最晚时刻，避免当天稍晚发布、仍在时间窗口内的文章被排除
+        published_at = published_at.replace(hour=23, minute=59, second=59)
+    return published_at
+
+
+def discover_recent_articles() -> List[Tuple[int, Optional[datetime]]]:
+    """从列表页解析 (文章ID, 发布时间) 列表，按 ID 倒序；列表页不可用时返回空列表"""
+    logger.info("开始从 AIBase 列表页发现文章...")
+    list_html = safe_get(AIBASE_LIST)
+    if not list_html:
+        logger.warning("无法获取 AIBase 新闻列表页")
+        return []
+
+    soup = BeautifulSoup(list_html, "html.parser")
+    entries: Dict[int, Optional[datetime]] = {}
+    for link in soup.find_all("a", href=True):
+        article_id = None
+        for pattern in AIBASE_ARTICLE_PATTERNS:
+            match = pattern.search(link["href"])
+            if match:
+                article_id = int(match.group(1))
+                break
+        if article_id is None:
+            continue
+        # 发布时间通常位于链接内的卡片文本中
+        published_at = parse_list_datetime(link.get_text(" ", strip=True))
+        if entries.get(article_id) is None:
+            entries[article_id] = published_at
+
+    logger.info(
+        f"列表页共发现 {len(entries)} 篇文章，"
+        f"其中 {sum(1 for dt in entries.values() if dt)} 篇含发布时间"
+    )
+    return sorted(entries.items(), key=lambda item: item[0], reverse=True)
 
-    async def fetch_with_semaphore(article_id):
-        async with semaphore:
-            # 随机延迟（0.5-1.5 秒，模拟人工浏览，降低反爬风险）
-            await asyncio.sleep(random.uniform(0.5, 1.5))
-            return await fetch_single_article_async(article_id, session)
 
-    tasks = [fetch_with_semaphore(aid) for aid in batch_ids]
+async def _fetch_batch_async(
+    batch_ids: List[int], http: AsyncHttpClient
+) -> List[Article]:
+    """
+    异步批量获取文章：并发请求数由客户端按主机限制（MAX_CONCURRENT_REQUESTS），
+    请求结束即释放，解析阶段只受 PARSE_QUEUE_SIZE 限制；请求节奏由 crawl_rate_limiter 控制
+    """
+    tasks = [fetch_single_article_async(aid, http) for aid in batch_ids]
     batch_results = await asyncio.gather(*tasks, return_exceptions=True)
 
     batch_articles = []
@@ -380,8 +630,61 @@ async def _fetch_batch_async(
     return batch_articles
 
 
-async def collect_recent_articles_async(hours: int, max_articles: int) -> List[Article]:
-    """异步批量爬取指定时间范围内的文章（并发批量爬取逻辑）"""
+async def _scan_articles_by_id_async(
+    http: AsyncHttpClient,
+    start_id: int,
+    cutoff_time: datetime,
+    max_articles: int,
+    collected_articles: List[Article],
+    on_articles: Optional[Callable[[List[Article]], Awaitable[None]]] = None,
+) -> None:
+    """从 start_id 往旧 ID 逐批扫描（列表页不可用或未覆盖时间窗口时的兜底）"""
+    current_id = start_id
+    no_new_count = 0  # 连续无新文章的次数（超过 3 次则停止爬取）
+    batch_step = BATCH_STEP  # 每批爬取数量
+
+    while (
+        current_id > 0
+        and len(collected_articles) < max_articles
+        and no_new_count < 3
+    ):
+        # 本次批次的文章 ID 列表（从 current_id 往回取 batch_step 个）
+        batch_ids = list(range(current_id, max(current_id - batch_step, 0), -1))
+        logger.info(f"当前批次爬取 ID：{batch_ids}")
+
+        # 并发爬取批次内的文章
+        batch_articles = await _fetch_batch_async(batch_ids, http)
+
+        # 筛选批次内符合时间范围的文章
+        new_articles = _filter_articles_by_time(batch_articles, cutoff_time)
+
+        # 更新爬取状态
+        if new_articles:
+            collected_articles.extend(new_articles)
+            no_new_count = 0  # 有新文章，重置连续无新计数
+            if on_articles:
+                await on_articles(new_articles)
+        else:
+            no_new_count += 1  # 无新文章，计数+1
+            logger.info(
+                f"本批次无符合条件的文章，剩余重试次数：{3 - no_new_count}",
+                "warning",
+            )
+
+        # 准备下一批次（ID 往前推 batch_step 个）
+        current_id -= batch_step
+        # 批次间延迟（仅固定间隔模式）
+        await crawl_rate_limiter.batch_pause()
+
+
+async def collect_recent_articles_async(
+    hours: int,
+    max_articles: int,
+    on_articles: Optional[Callable[[List[Article]], Awaitable[None]]] = None,
+) -> List[Article]:
+    """异步批量爬取指定时间范围内的文章（优先按列表页发现，ID 扫描兜底）
+    on_articles: 每批筛选通过的文章回调（流水线模式用于立即送入总结）
+    """
     start_time = time.time()
 
     # 1. 确定时间范围（仅保留 "hours" 小时内的文章）
@@ -391,55 +694,63 @@ async def collect_recent_articles_async(hours: int, max_articles: int) -> List[A
         f"开始爬取 {hours} 小时内的文章（截止时间：{cutoff_time.strftime('%Y-%m-%d %H:%M:%S')}）"
     )
 
-    # 2. 获取最新文章 ID（避免从 0 开始盲目爬取）
-    latest_id = discover_latest_article_id()
-    if not latest_id:
-        logger.warning("使用默认 ID=20805 作为起始爬取点（最新 ID 获取失败）")
-        latest_id = 20805
+    # 2. 从列表页发现文章及发布时间
+    entries = discover_recent_articles()
+    dated = [(aid, dt) for aid, dt in entries if dt]
 
-    # 3. 反向爬取（从最新 ID 往旧 ID 爬，确保优先获取最新文章）
     collected_articles: List[Article] = []
-    current_id = latest_id
-    no_new_count = 0  # 连续无新文章的次数（超过 3 次则停止爬取）
-    batch_step = BATCH_STEP  # 每批爬取数量
-
-    async with aiohttp.ClientSession() as session:
-        while (
-            current_id > 0
-            and len(collected_articles) < max_articles
-            and no_new_count < 3
-        ):
-            # 本次批次的文章 ID 列表（从 current_id 往回取 batch_step 个）
-            batch_ids = list(range(current_id, max(current_id - batch_step, 0), -1))
-            logger.info(f"当前批次爬取 ID：{batch_ids}")
-
-            # 并发爬取批次内的文章
-            batch_articles = await _fetch_batch_async(batch_ids, session)
-
-            # 筛选批次内符合时间范围的文章
-            new_articles = _filter_articles_by_time(batch_articles, cutoff_time)
-
-            # 更新爬取状态
-            if new_articles:
+    async with AsyncHttpClient(
+        AIBASE_HTTP_POLICY, http_validator_cache, crawl_rate_limiter
+    ) as http:
+        if dated:
+            # 3a. 只爬取列表页中处于时间窗口内的文章
+            window_ids = [aid for aid, dt in dated if dt >= cutoff_time]
+            logger.info(f"列表页中时间窗口内的文章：{window_ids}")
+            # 分批爬取（ID 倒序，即先新后旧），每批筛选后即可交给下游处理，够数即停止
+            for i in range(0, len(window_ids), BATCH_STEP):
+                if len(collected_articles) >= max_articles:
+                    logger.info(f"已收集 {len(collected_articles)} 篇文章，达到目标数量")
+                    break
+                batch_articles = await _fetch_batch_async(
+                    window_ids[i : i + BATCH_STEP], http
+                )
+                new_articles = _filter_articles_by_time(batch_articles, cutoff_time)
                 collected_articles.extend(new_articles)
-                no_new_count = 0  # 有新文章，重置连续无新计数
-            else:
-                no_new_count += 1  # 无新文章，计数+1
-                logger.info(
-                    f"本批次无符合条件的文章，剩余重试次数：{3 - no_new_count}",
-                    "warning",
+                if on_articles:
+                    await on_articles(new_articles)
+
+            # 列表页最旧的文章仍在窗口内，说明窗口超出列表范围，继续往旧 ID 扫描
+            if (
+                len(collected_articles) < max_articles
+                and min(dt for _, dt in dated) >= cutoff_time
+            ):
+                oldest_id = min(aid for aid, _ in entries)
+                logger.info(f"列表页未覆盖完整时间窗口，从 ID={oldest_id - 1} 继续扫描")
+                await _scan_articles_by_id_async(
+                    http,
+                    oldest_id - 1,
+                    cutoff_time,
+                    max_articles,
+                    collected_articles,
+                    on_articles,
                 )
-
-            # 准备下一批次（ID 往前推 batch_step 个）
-            current_id -= batch_step
-            # 批次间延迟（2-4 秒，进一步降低反爬概率）
-            await asyncio.sleep(random.uniform(2, 4))
+        else:
+            # 3b. 列表页不可用或无发布时间，退回 ID 扫描（从最新 ID 往旧 ID 爬）
+            if entries:
+                latest_id = entries[0][0]
+            else:
+                logger.warning("使用默认 ID=20805 作为起始爬取点（最新 ID 获取失败）")
+                latest_id = 20805
+            await _scan_articles_by_id_async(
+                http, latest_id, cutoff_time, max_articles, collected_articles, on_articles
+            )
 
     # 4. 去重 + 按发布时间倒序排序（确保最新文章在前）
     final_articles = _deduplicate_and_sort_articles(collected_articles, max_articles)
 
     # 记录统计信息
     _log_crawl_stats(start_time, len(collected_articles), len(final_articles))
+    crawl_rate_limiter.log_metrics()
 
     logger.info(
         f"爬取完成：共获取 {len(final_articles)} 篇符合条件的文章（目标 {max_articles} 篇）"
@@ -564,24 +875,39 @@ def generate_local_summary(article: Article) -> str:
     return content[:30].strip()
 
 
-def ai_summarize_article(client: OpenAI, model: str, article: Article) -> str:
-    """单篇文章 AI 总结（核心 AI 交互逻辑）"""
-    # AI 提示词（支持所有类型的文章）
-    system_prompt = (
-        "你是专业的文章摘要助手，需满足以下要求："
-        "1. 基于文章正文内容进行总结，不要简单重复标题；"
-        "2. 提炼文章的核心观点、重要事件或关键信息；"
-        "3. 输出15-50字的完整句子，确保语义完整，信息丰富；"
-        "4. 严格保留原文含义，不添加主观观点或额外信息；"
-        "5. 禁止使用 Markdown 格式、特殊符号、省略号，仅输出纯文本；"
-        "6. 输出一个完整的句子，不要截断或使用不完整的表达。"
-        "7. 支持所有类型的文章内容，包括科技、新闻、评论等。"
-    )
-    # 构造用户输入（只使用正文内容，避免 AI 被标题影响）
-    user_content = f"文章正文内容：{article.content[:1000]}"
+def _summary_input(article: Article) -> str:
+    """AI 总结的用户输入（同时作为摘要缓存的键）"""
+    return f"文章正文内容：{article.content[:1000]}"
+
 
+def _get_cached_summary(model: str, article: Article) -> Optional[str]:
+    """读取持久化摘要缓存（单篇与批量提示词的摘要均可复用），命中时无需调用 AI"""
+    user_content = _summary_input(article)
+    for prompt_version in (SUMMARY_PROMPT_VERSION, BATCH_SUMMARY_PROMPT_VERSION):
+        summary = summary_cache.get_summary(model, prompt_version, user_content)
+        if summary:
+            return summary
+    return None
+
+
+def _build_summary_payload(
+    model: str, user_content: str, system_prompt: Optional[str] = None
+) -> dict:
+    """构造 AI 总结请求参数（默认使用单篇文章提示词，批量总结传入批量提示词）"""
+    # AI 提示词（支持所有类型的文章）
+    if system_prompt is None:
+        system_prompt = (
+            "你是专业的文章摘要助手，需满足以下要求："
+            "1. 基于文章正文内容进行总结，不要简单重复标题；"
+            "2. 提炼文章的核心观点、重要事件或关键信息；"
+            "3. 输出15-50字的完整句子，确保语义完整，信息丰富；"
+            "4. 严格保留原文含义，不添加主观观点或额外信息；"
+            "5. 禁止使用 Markdown 格式、特殊符号、省略号，仅输出纯文本；"
+            "6. 输出一个完整的句子，不要截断或使用不完整的表达。"
+            "7. 支持所有类型的文章内容，包括科技、新闻、评论等。"
+        )
     # AI 请求参数（降低温度确保摘要准确性）
-    payload = {
+    return {
         "model": model,
         "messages": [
             {"role": "system", "content": system_prompt},
@@ -592,6 +918,34 @@ def ai_summarize_article(client: OpenAI, model: str, article: Article) -> str:
         "stream": False,
     }
 
+
+async def ai_summarize_article_async(
+    client: AsyncOpenAI, limiter: TokenBucket, model: str, article: Article
+) -> str:
+    """单篇文章 AI 总结（原生异步，限流与退避由 chat_completion 处理）"""
+    user_content = _summary_input(article)
+    content = await chat_completion(
+        client,
+        limiter,
+        _build_summary_payload(model, user_content),
+        retries=3,
+        label=f"文章 ID={article.id}",
+    )
+    # 清理摘要（去除多余空格和句号）
+    summary = re.sub(r"\s+", " ", content or "").strip().rstrip("。")
+    if not summary:
+        logger.error(f"AI总结失败，使用本地兜底：文章 ID={article.id}")
+        return generate_local_summary(article)
+    summary_cache.set_summary(model, SUMMARY_PROMPT_VERSION, user_content, summary)
+    return summary
+
+
+def ai_summarize_article(client: OpenAI, model: str, article: Article) -> str:
+    """单篇文章 AI 总结（核心 AI 交互逻辑）"""
+    # 构造用户输入（只使用正文内容，避免 AI 被标题影响）
+    user_content = _summary_input(article)
+    payload = _build_summary_payload(model, user_content)
+
     # 重试机制（应对 API 临时错误，最多重试 2 次）
     for retry in range(2):
         try:
@@ -599,7 +953,10 @@ def ai_summarize_article(client: OpenAI, model: str, article: Article) -> str:
             summary = resp.choices[0].message.content.strip()
             # 清理摘要（去除多余空格和句号）
             summary = re.sub(r"\s+", " ", summary).strip().rstrip("。")
-            return summary if summary else generate_local_summary(article)
+            if not summary:
+                return generate_local_summary(article)
+            summary_cache.set_summary(model, SUMMARY_PROMPT_VERSION, user_content, summary)
+            return summary
         except Exception as e:
             error_msg = str(e)
             if "rate limit" in error_msg.lower() or "429" in error_msg:
@@ -625,57 +982,261 @@ def ai_summarize_article(client: OpenAI, model: str, article: Article) -> str:
     return generate_local_summary(article)
 
 
-async def batch_ai_summarize_async(
-    articles: List[Article], api_key: str, model: str
-) -> List[Tuple[Article, str]]:
-    """异步批量文章 AI 总结（并发总结逻辑，提高效率）"""
-    if not articles:
-        return []
+def _estimate_tokens(text: str) -> int:
+    """粗略估算 token 数（中文约 1 字 1 token，偏保守）"""
+    return len(text)
 
-    # 创建 AI 客户端
-    ai_client = openai_client(api_key)
-    summarized_list = []
-    max_concurrent = MAX_CONCURRENT_AI  # AI 接口并发限制，避免触发限流
-    semaphore = asyncio.Semaphore(max_concurrent)
 
+def _pack_summary_batches(articles: List[Article]) -> List[List[Article]]:
+    """按 token 预算和条数上限把文章打包成多批"""
+    batches: List[List[Article]] = []
+    current: List[Article] = []
+    used = 0
+    for article in articles:
+        cost = _estimate_tokens(_summary_input(article)) + 20  # 20 为 JSON 结构开销
+        if current and (
+            used + cost > BATCH_SUMMARY_TOKEN_BUDGET
+            or len(current) >= BATCH_SUMMARY_MAX_ITEMS
+        ):
+            batches.append(current)
+            current, used = [], 0
+        current.append(article)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_summaries(content: str, articles: List[Article]) -> Dict[int, str]:
+    """解析批量总结返回的 JSON 数组，只保留 ID 匹配且摘要非空的条目"""
+    text = re.sub(r"^```(?:json)?|```$", "", (content or "").strip()).strip()
+    try:
+        items = json.loads(text)
+    except json.JSONDecodeError:
+        logger.warning("批量总结返回内容不是合法 JSON")
+        return {}
+    if not isinstance(items, list):
+        return {}
+    if len(items) != len(articles):
+        logger.warning(f"批量总结返回条数不符：期望 {len(articles)}，实际 {len(items)}")
+
+    expected_ids = {article.id for article in articles}
+    summaries: Dict[int, str] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            article_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        summary = re.sub(r"\s+", " ", str(item.get("summary") or "")).strip().rstrip("。")
+        if article_id in expected_ids and summary:
+            summaries[article_id] = summary
+    return summaries
+
+
+async def ai_summarize_batch_async(
+    client: AsyncOpenAI, limiter: TokenBucket, model: str, articles: List[Article]
+) -> Dict[int, str]:
+    """多篇文章一次请求批量总结，返回 {文章ID: 摘要}（解析失败的条目不返回）"""
+    system_prompt = (
+        "你是专业的文章摘要助手。输入是 JSON 数组，每项包含 id 和 content。"
+        "请为每篇文章输出 15-50 字的中文摘要：基于正文提炼核心观点或关键信息，"
+        "不重复标题，不添加主观观点，不使用 Markdown、特殊符号或省略号。"
+        '只输出 JSON 数组，格式为 [{"id": 文章id, "summary": "摘要"}]，'
+        "条目数量和 id 必须与输入一致。"
+    )
+    user_content = json.dumps(
+        [{"id": article.id, "content": article.content[:1000]} for article in articles],
+        ensure_ascii=False,
+    )
+    content = await chat_completion(
+        client,
+        limiter,
+        _build_summary_payload(model, user_content, system_prompt),
+        retries=2,
+        label=f"批量总结 {len(articles)} 篇",
+    )
+    summaries = _parse_batch_summaries(content, articles)
+    for article in articles:
+        if article.id in summaries:
+            summary_cache.set_summary(
+                model,
+                BATCH_SUMMARY_PROMPT_VERSION,
+                _summary_input(article),
+                summaries[article.id],
+            )
+    logger.info(f"批量总结完成：{len(summaries)}/{len(articles)} 篇成功")
+    return summaries
+
+
+async def _summarize_articles_async(
+    ai_client: Optional[AsyncOpenAI],
+    limiter: TokenBucket,
+    semaphore: asyncio.Semaphore,
+    model: str,
+    articles: List[Article],
+) -> Dict[int, str]:
+    """总结一组文章，返回 {文章ID: 摘要}（缓存 → 批量请求 → 逐篇兜底）"""
+    # 摘要缓存命中的文章无需调用 AI
+    summaries: Dict[int, str] = {}
+    for article in articles:
+        cached = _get_cached_summary(model, article)
+        if cached:
+            logger.info(f"摘要缓存命中：ID={article.id}")
+            summaries[article.id] = cached
+    pending = [article for article in articles if article.id not in summaries]
+
+    # 1. 批量模式：多篇文章打包为一次请求
+    if ai_client and pending and BATCH_SUMMARY_ENABLED:
+        batches = _pack_summary_batches(pending)
+        logger.info(f"批量总结：{len(pending)} 篇文章打包为 {len(batches)} 次请求")
+
+        async def summarize_batch(batch):
+            if len(batch) == 1:
+                return {}  # 单篇直接走逐篇总结
+            async with semaphore:
+                return await ai_summarize_batch_async(ai_client, limiter, model, batch)
+
+        for result in await asyncio.gather(
+            *(summarize_batch(batch) for batch in batches), return_exceptions=True
+        ):
+            if isinstance(result, dict):
+                summaries.update(result)
+            else:
+                logger.error(f"批量总结任务失败：{str(result)}")
+        pending = [article for article in pending if article.id not in summaries]
+
+    # 2. 逐篇总结：未启用批量模式或批量结果解析失败的文章
     async def summarize_with_semaphore(article, idx):
         async with semaphore:
             logger.info(
-                f"正在总结文章 {idx}/{len(articles)}：ID={article.id} → {article.title[:20]}..."
+                f"正在总结文章 {idx}/{len(pending)}：ID={article.id} → {article.title[:20]}..."
             )
             if ai_client:
-                # AI 总结（需要将同步的 AI 调用包装为异步）
-                loop = asyncio.get_event_loop()
-                summary = await loop.run_in_executor(
-                    None, ai_summarize_article, ai_client, model, article
+                # AI 总结（请求速率由令牌桶控制）
+                summary = await ai_summarize_article_async(
+                    ai_client, limiter, model, article
                 )
             else:
                 # 无 AI 时使用本地兜底
                 summary = generate_local_summary(article)
-
-            # 总结间延迟（避免 AI 接口请求过于密集）
-            await asyncio.sleep(random.uniform(0.3, 0.8))
             return (article, summary)
 
-    # 创建所有总结任务
-    tasks = [
-        summarize_with_semaphore(article, idx)
-        for idx, article in enumerate(articles, 1)
-    ]
-
     # 并发执行所有总结任务
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # 收集成功的结果
-    success_count = 0
+    results = await asyncio.gather(
+        *(summarize_with_semaphore(article, idx) for idx, article in enumerate(pending, 1)),
+        return_exceptions=True,
+    )
     for result in results:
         if isinstance(result, tuple) and len(result) == 2:
-            summarized_list.append(result)
-            success_count += 1
+            summaries[result[0].id] = result[1]
         elif isinstance(result, Exception):
             logger.error(f"总结任务失败：{str(result)}")
+    return summaries
+
+
+def _create_ai_resources(api_key: str):
+    """创建异步 AI 客户端（共享连接池）、令牌桶限流器与并发信号量"""
+    ai_client = async_openai_client(
+        api_key or AI_API_KEY, AI_BASE_URL, max_connections=MAX_CONCURRENT_AI
+    )
+    limiter = TokenBucket(AI_RATE_PER_SECOND, MAX_CONCURRENT_AI)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_AI)  # AI 接口并发限制，避免触发限流
+    return ai_client, limiter, semaphore
+
+
+async def batch_ai_summarize_async(
+    articles: List[Article], api_key: str, model: str
+) -> List[Tuple[Article, str]]:
+    """异步批量文章 AI 总结（多篇打包为一次请求，失败条目逐篇兜底）"""
+    if not articles:
+        return []
+
+    ai_client, limiter, semaphore = _create_ai_resources(api_key)
+    try:
+        summaries = await _summarize_articles_async(
+            ai_client, limiter, semaphore, model, articles
+        )
+    finally:
+        if ai_client:
+            await ai_client.close()
+
+    # 按原文章顺序输出
+    summarized_list = [
+        (article, summaries[article.id]) for article in articles if article.id in summaries
+    ]
+    logger.info(f"AI总结完成：成功 {len(summarized_list)}/{len(articles)} 篇文章")
+    return summarized_list
+
 
-    logger.info(f"AI总结完成：成功 {success_count}/{len(articles)} 篇文章")
+async def crawl_and_summarize_async(
+    hours: int, max_articles: int, api_key: str, model: str
+) -> List[Tuple[Article, str]]:
+    """流水线模式：爬取到符合时间范围的文章后立即送入总结，爬取与 AI 总结并行"""
+    article_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    result_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    ai_client, limiter, semaphore = _create_ai_resources(api_key)
+    queued_ids: set = set()
+
+    async def enqueue(new_articles: List[Article], capped: bool = True) -> None:
+        # 队列满时阻塞爬取（背压）；爬取过程中超过目标数量的文章暂不送入总结
+        for article in new_articles:
+            if article.id in queued_ids or (capped and len(queued_ids) >= max_articles):
+                continue
+            queued_ids.add(article.id)
+            await article_queue.put(article)
+
+    async def summarizer() -> None:
+        while True:
+            article = await article_queue.get()
+            if article is None:
+                return
+            # 取出队列中已就绪的文章组成小批量，便于批量总结
+            batch = [article]
+            while len(batch) < BATCH_SUMMARY_MAX_ITEMS and not article_queue.empty():
+                item = article_queue.get_nowait()
+                if item is None:
+                    await article_queue.put(None)  # 结束标记留给其他总结协程
+                    break
+                batch.append(item)
+            summaries = await _summarize_articles_async(
+                ai_client, limiter, semaphore, model, batch
+            )
+            for item in batch:
+                if item.id in summaries:
+                    await result_queue.put((item, summaries[item.id]))
+
+    async def renderer(results: List[Tuple[Article, str]]) -> None:
+        while True:
+            result = await result_queue.get()
+            if result is None:
+                return
+            results.append(result)
+            logger.info(f"已完成总结 {len(results)} 篇：ID={result[0].id}")
+
+    results: List[Tuple[Article, str]] = []
+    render_task = asyncio.create_task(renderer(results))
+    workers = [asyncio.create_task(summarizer()) for _ in range(PIPELINE_SUMMARIZERS)]
+    try:
+        articles = await collect_recent_articles_async(hours, max_articles, enqueue)
+        # 爬取结束：最终文章列表（按发布时间排序后截取）中未送入总结的全部补送，不受数量限制
+        await enqueue(articles, capped=False)
+    finally:
+        for _ in workers:
+            await article_queue.put(None)
+        await asyncio.gather(*workers, return_exceptions=True)
+        await result_queue.put(None)
+        await render_task
+        if ai_client:
+            await ai_client.close()
+
+    # 与非流水线模式一致：按最终文章列表（发布时间倒序）输出
+    summary_map = {article.id: summary for article, summary in results}
+    summarized_list = [
+        (article, summary_map[article.id]) for article in articles if article.id in summary_map
+    ]
+    logger.info(f"AI总结完成：成功 {len(summarized_list)}/{len(articles)} 篇文章")
     return summarized_list
 
 
@@ -694,6 +1255,11 @@ def batch_ai_summarize(
         logger.info(
             f"正在总结文章 {idx}/{len(articles)}：ID={article.id} → {article.title[:20]}..."
         )
+        cached = _get_cached_summary(model, article)
+        if cached:
+            logger.info(f"摘要缓存命中：ID={article.id}")
+            summarized_list.append((article, cached))
+            continue
         if ai_client:
             # AI 总结
             summary = ai_summarize_article(ai_client, model, article)
@@ -740,13 +1306,60 @@ DEFAULT_MODEL = "glm-4-flash"
 DEFAULT_CONCURRENT = True
 MAX_CONCURRENT_REQUESTS = 10  # 最大并发请求数
 MAX_CONCURRENT_AI = 30  # AI 接口并发限制
+AI_RATE_PER_SECOND = 3  # AI 接口平均请求速率（令牌桶，突发上限为 MAX_CONCURRENT_AI）
+BATCH_SUMMARY_ENABLED = True  # 多篇文章打包为一次 AI 请求
+BATCH_SUMMARY_TOKEN_BUDGET = 6000  # 单次批量请求的输入 token 预算（估算）
+BATCH_SUMMARY_MAX_ITEMS = 10  # 单次批量请求最多文章数
+PIPELINE_ENABLED = True  # 流水线模式：爬取与 AI 总结并行
+PIPELINE_QUEUE_SIZE = 20  # 流水线各阶段之间的队列容量（背压）
+PIPELINE_SUMMARIZERS = 3  # 流水线中并行的总结协程数
 BATCH_STEP = 10  # 每批爬取数量
+HTML_PARSER_BACKEND = "selectolax"  # 文章解析后端：selectolax / lxml / html.parser
+PARSE_EXECUTOR = "auto"  # 解析池类型：auto / process / thread
+PARSE_WORKERS = os.cpu_count() or 2  # 解析池工作数
+PARSE_QUEUE_SIZE = MAX_CONCURRENT_REQUESTS * 2  # 抓取与解析之间的最大积压页面数
 
 
 # 简单缓存
 _article_cache: Dict[int, Optional[Article]] = {}
 _cache_lock = asyncio.Lock()
 
+# HTML 解析池（首次使用时创建）
+_parse_executor: Optional[Executor] = None
+_parse_slots = asyncio.Semaphore(PARSE_QUEUE_SIZE)
+
+# 持久化文章缓存（跨运行复用，有效文章与无效文章分别设置过期时间）
+ARTICLE_CACHE_HIT_TTL = 7 * 24 * 3600
+ARTICLE_CACHE_MISS_TTL = 6 * 3600
+ARTICLE_GONE_STATUS = frozenset({404, 410})  # 明确不存在的文章，按无效文章缓存
+ARTICLE_CACHE_MAX_ENTRIES = 5000
+# 持久化 AI 摘要缓存，修改提示词时需同步更新对应版本号使旧摘要失效
+SUMMARY_PROMPT_VERSION = "v1"  # 单篇总结提示词（_build_summary_payload）
+BATCH_SUMMARY_PROMPT_VERSION = "batch-v1"  # 批量总结提示词（ai_summarize_batch_async）
+summary_cache = SummaryCache()
+
+# HTTP 条件请求缓存（ETag / Last-Modified），页面未修改时服务端返回 304
+http_validator_cache = ValidatorCache("ai_morning_brief_http.db", max_entries=500)
+
+article_disk_cache = DiskCache("ai_morning_brief_articles.db", ARTICLE_CACHE_MAX_ENTRIES)
+
+# 爬取限速：adaptive 按响应自动调速（快速 2xx 时加速，429/5xx/超时时降速），
+# 初始速率取固定间隔模式的实际速率（并发数 / 平均等待 1 秒）；
+# conservative 为原有的固定随机间隔（每篇 0.5-1.5 秒，每批 2-4 秒）
+CRAWL_RATE_MODE = "adaptive"
+CRAWL_RATE_PRESETS = {
+    "adaptive": RatePreset(
+        initial_rate=MAX_CONCURRENT_REQUESTS / 1.0, min_rate=1, max_rate=50, increase=0.5
+    ),
+    "conservative": RatePreset(adaptive=False, delay=(0.5, 1.5), batch_delay=(2, 4)),
+}
+crawl_rate_limiter = AdaptiveRateLimiter(CRAWL_RATE_PRESETS[CRAWL_RATE_MODE])
+
+# AIBase 请求策略：异步爬取每次运行新建客户端（需在事件循环内创建），
+# 同步请求（列表页、同步模式）共用一个连接池；两者都使用条件请求缓存
+AIBASE_HTTP_POLICY = HttpPolicy(timeout=15, per_host=MAX_CONCURRENT_REQUESTS)
+aibase_client = HttpClient(AIBASE_HTTP_POLICY, http_validator_cache)
+
 
 
 def main():
@@ -794,20 +1407,37 @@ def main():
 
 async def main_async(hours, max_articles, model):
     """异步主函数（并发模式）"""
-    # 1. 批量爬取符合条件的文章
     logger.info("=" * 50)
-    logger.info("步骤1：开始爬取 AIBase 文章（异步并发模式）")
-    logger.info("=" * 50)
-    articles = await collect_recent_articles_async(hours, max_articles)
-    if not articles:
-        logger.info("警告：未爬取到任何符合条件的文章，程序退出")
-        return
+    if PIPELINE_ENABLED:
+        # 1+2. 流水线：爬取到的文章立即送入 AI 总结
+        logger.info("步骤1-2：爬取 AIBase 文章并同步进行 AI 总结（流水线模式）")
+        logger.info("=" * 50)
+        try:
+            summarized_articles = await crawl_and_summarize_async(
+                hours, max_articles, AI_API_KEY, model
+            )
+        finally:
+            shutdown_parse_executor()
+        if not summarized_articles:
+            logger.info("警告：未获取到任何符合条件的文章总结，程序退出")
+            return
+    else:
+        # 1. 批量爬取符合条件的文章
+        logger.info("步骤1：开始爬取 AIBase 文章（异步并发模式）")
+        logger.info("=" * 50)
+        try:
+            articles = await collect_recent_articles_async(hours, max_articles)
+        finally:
+            shutdown_parse_executor()
+        if not articles:
+            logger.info("警告：未爬取到任何符合条件的文章，程序退出")
+            return
 
-    # 2. 批量 AI 总结文章
-    logger.info("=" * 50)
-    logger.info("步骤2：开始 AI 总结文章（异步并发模式）")
-    logger.info("=" * 50)
-    summarized_articles = await batch_ai_summarize_async(articles, AI_API_KEY, model)
+        # 2. 批量 AI 总结文章
+        logger.info("=" * 50)
+        logger.info("步骤2：开始 AI 总结文章（异步并发模式）")
+        logger.info("=" * 50)
+        summarized_articles = await batch_ai_summarize_async(articles, AI_API_KEY, model)
 
     # 3. 生成 Markdown 报告
     logger.info("=" * 50)
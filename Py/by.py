@@ -7,7 +7,7 @@ cron: 1 9 * * *
 
 变量名：BING_COOKIE  多账号换行
 """
-import requests
+import httpx
 import os
 import time
 import random
@@ -15,14 +15,15 @@ import json
 import datetime
 import urllib.parse
 import re
+from utils.http import HttpClient, HttpPolicy
 
 # --- 核心功能 ---
 
 
-def get_dashboard_data(session: requests.Session) -> tuple[dict | None, str | None]:
+def get_dashboard_data(client: HttpClient) -> tuple[dict | None, str | None]:
     """获取并解析 Bing Rewards 页面的 dashboard 数据和用户邮箱。"""
     try:
-        response = session.get(
+        response = client.get(
             "https://rewards.bing.com",
             headers={
                 "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0"
@@ -64,7 +65,7 @@ def get_dashboard_data(session: requests.Session) -> tuple[dict | None, str | No
 
         return dashboard_json, email
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print_log("网络错误", f"请求 Bing Rewards 页面失败: {e}")
         return None, None
     except Exception as e:
@@ -72,7 +73,7 @@ def get_dashboard_data(session: requests.Session) -> tuple[dict | None, str | No
         return None, None
 
 
-def bing_search(session: requests.Session, query_str: str):
+def bing_search(client: HttpClient, query_str: str):
     """执行单次电脑端 Bing 搜索。"""
     try:
         url = f"https://cn.bing.com/search?q={query_str}&qs=LT&form=TSASDS"
@@ -80,7 +81,7 @@ def bing_search(session: requests.Session, query_str: str):
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0",
             "referer": "https://rewards.bing.com/",
         }
-        response = session.get(url, headers=headers, timeout=10)
+        response = client.get(url, headers=headers, timeout=10)
         if response.status_code != 200:
             print_log(
                 "搜索失败",
@@ -91,7 +92,7 @@ def bing_search(session: requests.Session, query_str: str):
 
 
 def complete_daily_set_tasks(
-    session: requests.Session, dashboard_data: dict, request_token: str
+    client: HttpClient, dashboard_data: dict, request_token: str
 ):
     """完成每日任务集。"""
     print_log("任务检查", "--- 开始执行每日任务集 ---")
@@ -129,11 +130,11 @@ def complete_daily_set_tasks(
                 end="",
                 flush=True,
             )
-            response = session.post(
-                post_url, headers=post_headers, data=payload, timeout=15
+            response = client.post(
+                post_url, headers=post_headers, content=payload, timeout=15
             )
             time.sleep(random.uniform(2, 4))
-            if response.ok and response.json().get("status") == "Success":
+            if response.is_success and response.json().get("status") == "Success":
                 result = response.json()
                 print(f" 成功! 当前总积分: {result.get('balance', 'N/A')}。")
             else:
@@ -160,10 +161,10 @@ def print_log(title: str, msg: str):
     print(f"{now} [{title}]: {msg or ''}")
 
 
-def get_request_verification_token(session: requests.Session) -> str | None:
+def get_request_verification_token(client: HttpClient) -> str | None:
     """从页面提取 __RequestVerificationToken。"""
     try:
-        response = session.get("https://rewards.bing.com/")
+        response = client.get("https://rewards.bing.com/")
         response.raise_for_status()
         match = re.search(
             r'name="__RequestVerificationToken".*?value="([^"]+)"', response.text
@@ -172,7 +173,7 @@ def get_request_verification_token(session: requests.Session) -> str | None:
             return match.group(1)
         print_log("错误", "未能找到 __RequestVerificationToken。")
         return None
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         print_log("网络错误", f"获取验证令牌失败: {e}")
         return None
 
@@ -182,15 +183,19 @@ def get_request_verification_token(session: requests.Session) -> str | None:
 
 def start_main(bing_ck: str) -> str | None:
     """单个账号的完整任务流程，返回执行摘要。"""
-    session = requests.Session()
-    session.headers.update(
-        {
+    policy = HttpPolicy(
+        headers={
             "cookie": bing_ck,
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0",
         }
     )
+    with HttpClient(policy) as client:
+        return run_account_tasks(client)
 
-    dashboard_data, email = get_dashboard_data(session)
+
+def run_account_tasks(client: HttpClient) -> str | None:
+    """使用账号的客户端依次执行搜索、每日任务并汇总积分。"""
+    dashboard_data, email = get_dashboard_data(client)
     print_log("当前账号", email or "未能获取邮箱")
 
     if not dashboard_data:
@@ -226,7 +231,7 @@ def start_main(bing_ck: str) -> str | None:
         old_balance = start_balance
         for i in range(1, search_count + 1):
             query = urllib.parse.quote(get_random_char() + get_random_char())
-            bing_search(session, query)
+            bing_search(client, query)
             time.sleep(random.uniform(2.5, 4.5))
 
             wait_time = random.randint(15, 30)
@@ -234,7 +239,7 @@ def start_main(bing_ck: str) -> str | None:
             time.sleep(wait_time)
 
             if i % 3 == 0:
-                new_dashboard, _ = get_dashboard_data(session)
+                new_dashboard, _ = get_dashboard_data(client)
                 if new_dashboard:
                     new_balance = new_dashboard.get("userStatus", {}).get(
                         "availablePoints", old_balance
@@ -257,16 +262,16 @@ def start_main(bing_ck: str) -> str | None:
     time.sleep(random.uniform(2, 4))
 
     # 2. 执行每日任务
-    request_token = get_request_verification_token(session)
-    latest_dashboard, _ = get_dashboard_data(session)
+    request_token = get_request_verification_token(client)
+    latest_dashboard, _ = get_dashboard_data(client)
     if request_token and latest_dashboard:
-        complete_daily_set_tasks(session, latest_dashboard, request_token)
+        complete_daily_set_tasks(client, latest_dashboard, request_token)
     else:
         print_log("任务跳过", "未能获取每日任务所需信息，跳过此部分。")
 
     # 3. 获取最终积分并生成摘要
     time.sleep(random.uniform(2, 4))
-    final_dashboard, _ = get_dashboard_data(session)
+    final_dashboard, _ = get_dashboard_data(client)
     if final_dashboard:
         final_balance = final_dashboard.get("userStatus", {}).get(
             "availablePoints", start_balance
@@ -16,9 +16,9 @@ ELECTRICITY_BILL =
 import json
 import re
 import utils.pyEnv as env
+from utils.http import HttpClient, HttpPolicy
 
-import requests
-from requests.exceptions import RequestException
+import httpx
 
 
 # 常量定义
@@ -36,6 +36,9 @@ HEADERS = {
     "Accept-Language": "zh-CN,zh;q=0.9",
 }
 
+# 多账户查询共用一个连接池
+client = HttpClient(HttpPolicy(verify=False, cookies=COOKIES))
+
 
 def sanitize_json(json_str):
     """修复各种JSON格式问题"""
@@ -66,11 +69,9 @@ def sanitize_json(json_str):
 
 def fetch_electricity_info(account_data: dict):
     try:
-        response = requests.post(
-            URL, cookies=COOKIES, headers=HEADERS, data=account_data, verify=False
-        )
+        response = client.post(URL, headers=HEADERS, data=account_data)
         response.raise_for_status()
-    except RequestException as e:
+    except httpx.HTTPError as e:
         print(f"[{account_data.get('userFj', '未知')}]: 请求失败: {e}")
         return None
 
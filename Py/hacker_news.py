@@ -3,6 +3,8 @@ Hacker News 早报（评论摘要版）
 name: Hacker News早报
 cron: 30 8 * * *
 
+依赖：httpx[http2]（可选，未安装 h2 时退回 HTTP/1.1）
+
 功能说明：
 - 获取 Hacker News 热门故事
 - 提取并总结社区评论
@@ -11,15 +13,25 @@ cron: 30 8 * * *
 """
 
 import asyncio
+import html
+import json
 import re
 import time
-import random
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple, Dict, Any
+from typing import Callable, List, Optional, Tuple, Dict, Any
 import utils.pyEnv as env
-from openai import OpenAI
-import httpx
+from openai import AsyncOpenAI
+from utils.http import (
+    HTTP2_AVAILABLE,
+    AdaptiveRateLimiter,
+    AsyncHttpClient,
+    HttpPolicy,
+    RatePreset,
+    ValidatorCache,
+)
+from utils.store import SqliteStore, SummaryCache
+from utils.ai import TokenBucket, async_openai_client, chat_completion
 from loguru import logger
 
 AI_API_KEY = env.get_env("AI_API_KEY")[0]
@@ -37,6 +49,7 @@ TZ_LOCAL = datetime.now().astimezone().tzinfo
 HN_TOP_STORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_NEW_STORIES_URL = "https://hacker-news.firebaseio.com/v0/newstories.json"
 HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{}.json"
+HN_UPDATES_URL = "https://hacker-news.firebaseio.com/v0/updates.json"
 
 # Hacker News API 配置
 # 使用官方 Firebase API，无需认证
@@ -46,7 +59,7 @@ HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{}.json"
 class HNComment:
     """Hacker News 评论数据结构"""
     id: int
-    text: str
+    text: str  # 规整后的纯文本（见 normalize_comment_text）
     by: str
     time: datetime
     parent: int
@@ -66,6 +79,7 @@ class HNStory:
     descendants: int
     text: Optional[str] = None
     category: str = "general"
+    kids: Optional[List[int]] = None  # 顶层评论 ID（按 HN 排序）
     comments: Optional[List[HNComment]] = None  # 评论列表
     comment_summary: Optional[str] = None  # AI 总结的评论摘要
 
@@ -75,150 +89,318 @@ def _get_story_category(title: str, url: Optional[str]) -> str:
     return "general"
 
 
-# 内存缓存，避免重复请求
-_story_cache: Dict[int, Optional[HNStory]] = {}
-_comment_cache: Dict[int, Optional[HNComment]] = {}
+# 评论抓取预算（按条目计，每个条目一次请求）
+MAX_COMMENTS_PER_STORY = 10  # 单个故事最多获取的评论数
+MAX_COMMENTS_PER_RUN = 100  # 整次运行最多获取的评论数
+COMMENT_MAX_TOKENS = 150  # 单条评论正文的 token 预算
+CHARS_PER_TOKEN = 4  # 粗略估算：英文约 4 个字符 1 token
 
+class HNItemStore(SqliteStore):
+    """
+    HN 条目本地存储（跨运行复用）：故事的分数/评论数、评论的回复列表（kids）会变化，
+    发布时间与编辑期结束后的评论正文不变，读取时由调用方按条目与存储时间判断能否复用
+    """
 
-async def fetch_comment_details(
-    client: httpx.AsyncClient, cid: int
-) -> Optional[HNComment]:
-    """获取单个评论的详细信息"""
-    # 检查缓存
-    if cid in _comment_cache:
-        logger.debug(f"从缓存获取评论：ID={cid}")
-        return _comment_cache[cid]
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
 
-    try:
-        logger.debug(f"正在获取评论：ID={cid}")
-        r = await client.get(HN_ITEM_URL.format(cid), timeout=10)
+    def get_many(self, item_ids: List[int]) -> Dict[int, Tuple[Dict[str, Any], float]]:
+        """批量读取条目，返回 {ID: (条目, 存储时间)}，不存在的条目不返回"""
+        found: Dict[int, Tuple[Dict[str, Any], float]] = {}
+        with self._connect() as conn:
+            for i in range(0, len(item_ids), 500):  # 控制单条 SQL 的参数个数
+                chunk = item_ids[i : i + 500]
+                rows = conn.execute(
+                    f"SELECT id, data, fetched_at FROM items "
+                    f"WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update(
+                    (row["id"], (json.loads(row["data"]), row["fetched_at"])) for row in rows
+                )
+        return found
+
+    def put_many(self, items: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?)",
+                ((item["id"], json.dumps(item, ensure_ascii=False), now) for item in items),
+            )
+
+    def invalidate(self, item_ids: List[int]) -> int:
+        """删除已变更的条目（下次使用时重新拉取），返回删除数量"""
+        with self._connect() as conn:
+            return conn.executemany(
+                "DELETE FROM items WHERE id = ?", ((iid,) for iid in item_ids)
+            ).rowcount
+
+    def prune(self, max_age: float) -> None:
+        """清理超过保留期的条目"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM items WHERE fetched_at < ?", (time.time() - max_age,))
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+
+# 判断本地存储的条目能否复用：(条目, 存储时间) -> bool
+ItemReuse = Callable[[Dict[str, Any], float], bool]
+
+
+def reuse_recent(max_age: float) -> ItemReuse:
+    """复用 max_age 秒内存储的条目（分数、kids 等可变字段仍足够新）"""
+    return lambda item, fetched_at: fetched_at >= time.time() - max_age
+
+
+def reuse_story(cutoff: datetime) -> ItemReuse:
+    """
+    故事复用规则：发布时间早于截止时间的故事不会再入选（发布时间不变），任何存储副本都可用于排除，
+    无需重新请求；其余故事需要最新分数，只复用 HN_ITEM_MAX_AGE 内的副本
+    """
+    recent = reuse_recent(HN_ITEM_MAX_AGE)
+    return lambda item, fetched_at: (
+        item.get("time", 0) < cutoff.timestamp() or recent(item, fetched_at)
+    )
+
+
+def reuse_settled(item: Dict[str, Any], fetched_at: float) -> bool:
+    """评论正文发布 HN_EDIT_WINDOW 后不可再编辑，此后存储的副本正文不变（kids 可能已滞后）"""
+    return fetched_at >= item.get("time", 0) + HN_EDIT_WINDOW
+
+
+class HNClient:
+    """
+    Hacker News API 客户端：整次运行复用同一个 HTTP 客户端（启用 HTTP/2 时所有请求在一条连接上多路复用），
+    条目优先读取本地存储，缺失或不可复用时请求 API 并写回
+    """
+
+    def __init__(self, http: AsyncHttpClient, store: HNItemStore):
+        self.http = http
+        self.store = store
+
+    async def get_json(self, url: str) -> Any:
+        r = await self.http.get(url)
         r.raise_for_status()
-        data = r.json()
-        
-        if not data or data.get("type") != "comment":
-            logger.warning(f"评论 {cid} 数据无效或类型错误")
-            _comment_cache[cid] = None
-            return None
-
-        comment = HNComment(
-            id=cid,
-            text=data.get("text", ""),
-            by=data.get("by", ""),
-            time=datetime.fromtimestamp(data.get("time", 0), tz=TZ_LOCAL),
-            parent=data.get("parent", 0),
-            kids=data.get("kids"),
+        return r.json()
+
+    async def get_items(
+        self, item_ids: List[int], reuse: Optional[ItemReuse] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        批量获取条目，按请求顺序返回
+        @param reuse: 本地存储条目的复用规则，None 表示存储的条目都可复用
+        @return: 与 item_ids 一一对应，不存在或获取失败的位置为 None
+        """
+        items = {
+            iid: item
+            for iid, (item, fetched_at) in self.store.get_many(item_ids).items()
+            if reuse is None or reuse(item, fetched_at)
+        }
+        missing = [iid for iid in dict.fromkeys(item_ids) if iid not in items]
+        if missing:
+            logger.debug(f"本地存储命中 {len(items)} 个条目，请求 {len(missing)} 个条目")
+            results = await asyncio.gather(
+                *(self.get_json(HN_ITEM_URL.format(iid)) for iid in missing),
+                return_exceptions=True,
+            )
+            fetched = []
+            for iid, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"获取条目 {iid} 失败: {result}")
+                elif result:
+                    items[iid] = result
+                    fetched.append(result)
+            self.store.put_many(fetched)
+        return [items.get(iid) for iid in item_ids]
+
+    async def story_ids(self, story_type: str = "top") -> List[int]:
+        """获取故事 ID 列表"""
+        url = {"top": HN_TOP_STORIES_URL, "new": HN_NEW_STORIES_URL}[story_type]
+        return await self.get_json(url)
+
+    async def sync_store(self) -> None:
+        """
+        增量同步本地条目：距上次同步不超过 HN_UPDATES_WINDOW 时，删除 updates 接口列出的已变更条目
+        （包括已复用正文的评论被删除等）；间隔更长时 updates 接口无法覆盖，跳过请求，
+        只按各条目的复用规则判断
+        """
+        self.store.prune(HN_STORE_RETENTION)
+        now = time.time()
+        last_sync = float(self.store.get_meta("last_sync") or 0)
+        if now - last_sync > HN_UPDATES_WINDOW:
+            logger.info("距上次运行超过 updates 接口的覆盖范围，跳过增量同步")
+            self.store.set_meta("last_sync", str(now))
+            return
+        try:
+            changed = (await self.get_json(HN_UPDATES_URL) or {}).get("items", [])
+        except Exception as e:
+            logger.warning(f"同步本地条目失败，继续使用已存储条目: {e}")
+            return
+        invalidated = self.store.invalidate(changed)
+        self.store.set_meta("last_sync", str(now))
+        logger.info(
+            f"本地条目同步完成：{len(changed)} 个条目有变更（本地失效 {invalidated} 个）"
         )
-        _comment_cache[cid] = comment
-        logger.debug(f"成功获取评论：ID={cid}, 作者={comment.by}")
-        return comment
-    except Exception as e:
-        logger.warning(f"获取评论 {cid} 失败: {e}")
-        _comment_cache[cid] = None
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def __aenter__(self) -> "HNClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+def hn_client() -> HNClient:
+    """创建本次运行使用的 HN 客户端（需在事件循环内调用）"""
+    return HNClient(
+        AsyncHttpClient(HN_HTTP_POLICY, hn_validator_cache, hn_rate_limiter), item_store
+    )
+
+
+_PARAGRAPH_RE = re.compile(r"<p>|<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+def normalize_comment_text(raw: str, max_tokens: int = COMMENT_MAX_TOKENS) -> str:
+    """
+    将 HN 评论 HTML 规整为纯文本：段落转换行、去标签、解码实体、去掉引用的上文（以 > 开头的段落），
+    并按 token 预算截断
+    """
+    if not raw:
+        return ""
+    text = html.unescape(_TAG_RE.sub("", _PARAGRAPH_RE.sub("\n", raw)))
+    lines = (_SPACE_RE.sub(" ", line).strip() for line in text.split("\n"))
+    text = "\n".join(line for line in lines if line and not line.startswith(">"))
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+
+
+def _parse_comment(data: Optional[Dict[str, Any]]) -> Optional[HNComment]:
+    """将条目数据转换为评论（正文在此规整一次），非评论条目返回 None"""
+    if not data or data.get("type") != "comment":
         return None
+    return HNComment(
+        id=data["id"],
+        text=normalize_comment_text(data.get("text", "")),
+        by=data.get("by", ""),
+        time=datetime.fromtimestamp(data.get("time", 0), tz=TZ_LOCAL),
+        parent=data.get("parent", 0),
+        kids=data.get("kids"),
+    )
+
+
+def _parse_story(data: Optional[Dict[str, Any]]) -> Optional[HNStory]:
+    """将条目数据转换为故事（不含评论），非故事条目返回 None"""
+    if not data or data.get("type") != "story":
+        return None
+    sid = data["id"]
+    return HNStory(
+        id=sid,
+        title=data.get("title", ""),
+        url=data.get("url"),
+        hn_url=f"https://news.ycombinator.com/item?id={sid}",
+        score=data.get("score", 0),
+        by=data.get("by", ""),
+        time=datetime.fromtimestamp(data.get("time", 0), tz=TZ_LOCAL),
+        descendants=data.get("descendants", 0),
+        text=data.get("text"),
+        category=_get_story_category(data.get("title", ""), data.get("url")),
+        kids=data.get("kids"),
+        comments=None,
+        comment_summary=None,
+    )
+
+
+class CommentBudget:
+    """评论条目预算（整次运行共享），用于控制评论请求总数"""
+
+    def __init__(self, total: int):
+        self.remaining = total
+
+    def take(self, n: int) -> int:
+        """申请 n 个条目，返回实际分配的数量"""
+        granted = max(0, min(n, self.remaining))
+        self.remaining -= granted
+        return granted
 
 
 async def fetch_comments_for_story(
-    client: httpx.AsyncClient,
+    client: HNClient,
     story_id: int,
     comment_ids: List[int],
-    max_comments: int = 10,
+    budget: CommentBudget,
+    max_comments: int = MAX_COMMENTS_PER_STORY,
 ) -> List[HNComment]:
-    """获取故事的评论列表，包括部分子评论"""
+    """
+    按层（广度优先）获取故事评论：每层一次批量拉取（并发受客户端的按主机并发数限制），
+    展开下一层时优先各分支的靠前回复，其次是回复较多的分支
+    @param budget: 整次运行共享的评论条目预算
+    @param max_comments: 单个故事的评论条目预算
+    """
     comments: List[HNComment] = []
     if not comment_ids:
         logger.info(f"故事 {story_id} 无评论")
         return comments
 
-    # 限制获取的评论数量，避免过多请求
-    limited_ids = comment_ids[:max_comments]
-    logger.info(f"故事 {story_id} 开始获取 {len(limited_ids)} 条评论")
-
-    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-
-    async def fetch(cid):
-        async with sem:
-            await asyncio.sleep(random.uniform(0.1, 0.3))  # 避免请求过快
-            return await fetch_comment_details(client, cid)
-
-    tasks = [fetch(cid) for cid in limited_ids]
-    results = await asyncio.gather(*tasks)
-
-    for res in results:
-        if isinstance(res, HNComment):
-            comments.append(res)
-            # 如果有子评论，也获取一部分
-            if res.kids and len(comments) < max_comments:
-                child_comments = await fetch_comments_for_story(
-                    client, story_id, res.kids, max_comments - len(comments)
-                )
-                comments.extend(child_comments)
-
-    logger.info(f"故事 {story_id} 成功获取 {len(comments)} 条评论")
-    return comments[:max_comments]
-
-
-async def fetch_story_details(client: httpx.AsyncClient, sid: int) -> Optional[HNStory]:
-    """获取单个故事的详细信息，包括评论"""
-    # 检查缓存
-    if sid in _story_cache:
-        logger.debug(f"从缓存获取故事：ID={sid}")
-        return _story_cache[sid]
-
-    try:
-        logger.debug(f"正在获取故事：ID={sid}")
-        r = await client.get(HN_ITEM_URL.format(sid), timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        
-        if not data or data.get("type") != "story":
-            logger.warning(f"故事 {sid} 数据无效或类型错误")
-            _story_cache[sid] = None
-            return None
-
-        story = HNStory(
-            id=sid,
-            title=data.get("title", ""),
-            url=data.get("url"),
-            hn_url=f"https://news.ycombinator.com/item?id={sid}",
-            score=data.get("score", 0),
-            by=data.get("by", ""),
-            time=datetime.fromtimestamp(data.get("time", 0), tz=TZ_LOCAL),
-            descendants=data.get("descendants", 0),
-            text=data.get("text"),
-            category=_get_story_category(data.get("title", ""), data.get("url")),
-            comments=None,
-            comment_summary=None,
+    frontier = list(comment_ids)
+    story_budget = max_comments
+    depth = 0
+    while frontier and story_budget > 0:
+        take = budget.take(min(len(frontier), story_budget))
+        if not take:
+            logger.info(f"评论请求预算已用完，故事 {story_id} 停止获取评论")
+            break
+        story_budget -= take
+        # 本层之后不再展开时只需评论正文，复用编辑期结束后存储的副本；
+        # 还要展开时 kids 决定下一层取哪些回复，只复用短时间内存储的评论
+        last_level = story_budget == 0 or budget.remaining == 0
+        reuse = reuse_settled if last_level else reuse_recent(HN_ITEM_MAX_AGE)
+        items = await client.get_items(frontier[:take], reuse)
+        level = [c for c in map(_parse_comment, items) if c]
+        comments.extend(level)
+        logger.debug(f"故事 {story_id} 第 {depth} 层获取 {len(level)}/{take} 条评论")
+
+        # 下一层候选：(回复序号, -分支回复数, 父评论序号)，即先取每个分支的首条回复
+        candidates = sorted(
+            (pos, -len(parent.kids), idx, kid)
+            for idx, parent in enumerate(level)
+            for pos, kid in enumerate(parent.kids or [])
         )
+        frontier = [kid for *_, kid in candidates]
+        depth += 1
 
-        # 获取评论
-        if data.get("kids") and len(data.get("kids", [])) > 0:
-            logger.info(f"故事 {sid} 有 {len(data.get('kids', []))} 条评论，开始获取")
-            story.comments = await fetch_comments_for_story(
-                client, sid, data.get("kids", []), max_comments=10
-            )
-        else:
-            logger.info(f"故事 {sid} 无评论")
+    logger.info(f"故事 {story_id} 成功获取 {len(comments)} 条评论")
+    return comments
 
-        _story_cache[sid] = story
-        logger.info(f"成功获取故事：ID={sid}, 标题={story.title[:50]}...")
-        return story
-    except Exception as e:
-        logger.warning(f"获取故事 {sid} 失败: {e}")
-        _story_cache[sid] = None
-        return None
 
-
-async def fetch_story_ids(story_type: str = "top") -> List[int]:
-    """获取故事 ID 列表"""
-    url = {"top": HN_TOP_STORIES_URL, "new": HN_NEW_STORIES_URL}[story_type]
-    logger.info(f"正在获取 {story_type} 故事列表...")
-    
-    async with httpx.AsyncClient() as c:
-        r = await c.get(url, timeout=10)
-        r.raise_for_status()
-        ids = r.json()
-        logger.info(f"成功获取 {len(ids)} 个故事 ID")
-        return ids
+async def fetch_story_comments(
+    client: HNClient, story: HNStory, budget: CommentBudget
+) -> None:
+    """为已入选的故事获取评论"""
+    if story.kids:
+        logger.info(f"故事 {story.id} 有 {len(story.kids)} 条顶层评论，开始获取")
+        story.comments = await fetch_comments_for_story(client, story.id, story.kids, budget)
+    else:
+        logger.info(f"故事 {story.id} 无评论")
 
 
 async def collect_recent_stories_async(
@@ -226,54 +408,60 @@ async def collect_recent_stories_async(
 ) -> List[HNStory]:
     """
     收集指定时间范围内的热门故事
+    阶段一只拉取故事元数据并按时间/分数筛选，阶段二只为最终入选的故事获取评论
     """
     start = time.time()
     cutoff = datetime.now(TZ_LOCAL) - timedelta(hours=hours)
     logger.info(f"时间筛选：获取 {hours} 小时内的故事（截止时间：{cutoff:%F %T}）")
     logger.info(f"最低分数要求：{min_score}")
 
-    ids = await fetch_story_ids(story_type)
-    if not ids:
-        logger.warning("未获取到任何故事 ID")
-        return []
-
-    # 并发拉取，控制并发数量
-    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    stories: List[HNStory] = []
+    async with hn_client() as client:
+        logger.info(f"正在获取 {story_type} 故事列表...")
+        ids = await client.story_ids(story_type)
+        if not ids:
+            logger.warning("未获取到任何故事 ID")
+            return []
+        logger.info(f"成功获取 {len(ids)} 个故事 ID")
 
-    async def fetch(sid):
-        async with sem:
-            await asyncio.sleep(random.uniform(0.1, 0.3))  # 避免请求过快
-            return await fetch_story_details(session, sid)
+        await client.sync_store()
 
-    stories: List[HNStory] = []
-    async with httpx.AsyncClient() as session:
+        # 阶段一：故事元数据（分数与评论数会变化，只有已知早于截止时间的故事可直接复用存储副本）
+        reuse = reuse_story(cutoff)
         for i in range(0, len(ids), 50):  # 每批处理 50 个
             batch = ids[i : i + 50]
             logger.info(f"处理批次 {i//50 + 1}：故事 ID {batch[0]} - {batch[-1]}")
-            
-            tasks = [fetch(sid) for sid in batch]
-            for res in await asyncio.gather(*tasks):
-                if (
-                    isinstance(res, HNStory)
-                    and res.time >= cutoff
-                    and res.score >= min_score
-                ):
+
+            items = await client.get_items(batch, reuse)
+            results = [r for r in map(_parse_story, items) if r]
+            for res in results:
+                if res.time >= cutoff and res.score >= min_score:
                     stories.append(res)
                     logger.info(f"符合条件的故事：{res.title[:50]}... (分数: {res.score})")
-            
+
             if len(stories) >= max_stories:
                 logger.info(f"已收集到 {len(stories)} 个故事，达到目标数量")
                 break
-            await asyncio.sleep(random.uniform(0.5, 1.0))  # 批次间延迟
+            # new 列表按发布时间倒序，出现早于截止时间的故事即可提前结束
+            if story_type == "new" and any(r.time < cutoff for r in results):
+                logger.info("后续故事均早于截止时间，提前结束扫描")
+                break
+            await hn_rate_limiter.batch_pause()  # 批次间延迟（仅固定间隔模式）
+
+        stories.sort(key=lambda s: s.score, reverse=True)
+        final_stories = stories[:max_stories]
+
+        # 阶段二：只为最终入选的故事获取评论（共享连接与请求预算）
+        logger.info(f"开始为 {len(final_stories)} 个入选故事获取评论")
+        budget = CommentBudget(MAX_COMMENTS_PER_RUN)
+        await asyncio.gather(*(fetch_story_comments(client, s, budget) for s in final_stories))
 
-    stories.sort(key=lambda s: s.score, reverse=True)
-    final_stories = stories[:max_stories]
     logger.info(f"收集完成：{len(final_stories)} 个故事，耗时 {time.time()-start:.1f} 秒")
     return final_stories
 
 
-def openai_client(api_key=None, base_url=None) -> Optional[OpenAI]:
-    """创建 OpenAI 客户端"""
+def openai_client(api_key=None, base_url=None) -> Optional[AsyncOpenAI]:
+    """创建异步 OpenAI 客户端（共享连接池）"""
     key = api_key or AI_API_KEY
     url = base_url or AI_BASE_URL
     if not key or len(key) < 10:
@@ -281,7 +469,7 @@ def openai_client(api_key=None, base_url=None) -> Optional[OpenAI]:
         return None
     try:
         logger.info("正在创建 OpenAI 客户端...")
-        client = OpenAI(api_key=key, base_url=url)
+        client = async_openai_client(key, url, max_connections=MAX_CONCURRENT_AI)
         logger.info("OpenAI 客户端创建成功")
         return client
     except Exception as e:
@@ -293,7 +481,23 @@ def generate_local_summary(story: HNStory) -> str:
     """生成本地摘要（兜底方案）"""
     return story.title if len(story.title) <= 60 else story.title[:57] + "..."
 
-def ai_summarize_comments(client: OpenAI, model: str, story: HNStory) -> str:
+def _build_comment_input(story: HNStory) -> str:
+    """构造评论总结的用户输入（同时作为摘要缓存的键），无有效评论时返回空串"""
+    # 评论正文已在获取时规整为纯文本
+    comment_texts = [
+        f"用户{comment.by}：{comment.text}"
+        for comment in story.comments or []
+        if comment.text
+    ]
+
+    if not comment_texts:
+        return ""
+    return "评论列表：\n" + "\n".join(comment_texts)
+
+
+async def ai_summarize_comments(
+    client: AsyncOpenAI, limiter: TokenBucket, model: str, story: HNStory
+) -> str:
     """使用 AI 总结故事的评论"""
     if not story.comments or len(story.comments) == 0:
         logger.info(f"故事 {story.id} 无评论，跳过总结")
@@ -301,20 +505,12 @@ def ai_summarize_comments(client: OpenAI, model: str, story: HNStory) -> str:
 
     logger.info(f"开始总结故事 {story.id} 的 {len(story.comments)} 条评论")
 
-    # 提取评论文本（去除HTML标签）
-    comment_texts = []
-    for comment in story.comments:
-        if comment.text:
-            # 简单去除HTML标签
-            clean_text = re.sub(r"<.*?>", "", comment.text)
-            comment_texts.append(f"用户{comment.by}：{clean_text}")
-
-    if not comment_texts:
+    user = _build_comment_input(story)
+    if not user:
         logger.warning(f"故事 {story.id} 评论文本为空")
         return "暂无有价值的评论"
 
     system = "你是专业评论摘要助手，请用中文 30 字左右总结以下HN评论的主要观点和讨论焦点，不添加个人观点，不输出markdown，只要重要的观点"
-    user = "评论列表：\n" + "\n".join(comment_texts)
 
     payload = dict(
         model=model,
@@ -326,20 +522,18 @@ def ai_summarize_comments(client: OpenAI, model: str, story: HNStory) -> str:
         top_p=0.8,
     )
 
-    for retry in range(3):
-        try:
-            logger.debug(f"故事 {story.id} 评论总结第 {retry+1} 次尝试")
-            resp = client.chat.completions.create(**payload)
-            summary = re.sub(r"\s+", " ", resp.choices[0].message.content).strip()
-            logger.info(f"故事 {story.id} 评论总结成功")
-            return summary
-        except Exception as e:
-            wait = 2**retry
-            logger.warning(f"故事 {story.id} 评论总结失败（重试 {retry+1}/3）: {e} -> 等待 {wait}s")
-            time.sleep(wait)
-    
-    logger.error(f"故事 {story.id} 评论总结多次失败")
-    return ""
+    content = await chat_completion(
+        client, limiter, payload, retries=3, label=f"故事 {story.id}"
+    )
+    if content is None:
+        logger.error(f"故事 {story.id} 评论总结多次失败")
+        return ""
+
+    summary = re.sub(r"\s+", " ", content).strip()
+    logger.info(f"故事 {story.id} 评论总结成功")
+    if summary:
+        summary_cache.set_summary(model, SUMMARY_PROMPT_VERSION, user, summary)
+    return summary
 
 
 async def batch_ai_summarize_async(
@@ -357,17 +551,24 @@ async def batch_ai_summarize_async(
         return stories
     
     sem = asyncio.Semaphore(MAX_CONCURRENT_AI)
+    limiter = TokenBucket(AI_RATE_PER_SECOND, MAX_CONCURRENT_AI)
 
     async def do(story, idx):
-        async with sem:
-            await asyncio.sleep(random.uniform(0.2, 0.5))  # 避免请求过快
-            loop = asyncio.get_event_loop()
+        # 摘要缓存命中时直接复用，不调用 AI
+        cached = summary_cache.get_summary(
+            model, SUMMARY_PROMPT_VERSION, _build_comment_input(story)
+        )
+        if cached:
+            logger.info(f"故事 {idx}/{len(stories)} 摘要缓存命中")
+            story.comment_summary = cached
+            return story
 
-            # 只总结评论
+        async with sem:
+            # 只总结评论（请求速率由令牌桶控制）
             if story.comments and len(story.comments) > 0:
                 logger.info(f"正在总结故事 {idx}/{len(stories)}：{story.title[:30]}...")
-                comment_summary = await loop.run_in_executor(
-                    None, ai_summarize_comments, client, model, story
+                comment_summary = await ai_summarize_comments(
+                    client, limiter, model, story
                 )
                 story.comment_summary = comment_summary
             else:
@@ -377,6 +578,7 @@ async def batch_ai_summarize_async(
 
     tasks = [do(s, i) for i, s in enumerate(stories, 1)]
     results = await asyncio.gather(*tasks, return_exceptions=True)
+    await client.close()
     ok = [r for r in results if isinstance(r, HNStory)]
     logger.info(f"评论总结完成：成功 {len(ok)}/{len(stories)} 个故事")
     return ok
@@ -414,8 +616,38 @@ DEFAULT_HOURS = 24  # 默认获取24小时内的故事
 DEFAULT_MAX_STORIES = 10  # 默认最多10个故事
 DEFAULT_MODEL = "glm-4-flash"  # 默认AI模型
 DEFAULT_CONCURRENT = True  # 默认使用并发模式
-MAX_CONCURRENT_REQUESTS = 15  # 最大并发请求数
+# 最大并发请求数：HTTP/2 下为单连接上的并发流数；退回 HTTP/1.1 时为连接数，保持原来的 15
+MAX_CONCURRENT_REQUESTS = 50 if HTTP2_AVAILABLE else 15
 MAX_CONCURRENT_AI = 20  # AI接口最大并发数
+AI_RATE_PER_SECOND = 3  # AI接口平均请求速率（令牌桶）
+SUMMARY_PROMPT_VERSION = "v1"  # 修改提示词时需同步更新，使旧摘要缓存失效
+summary_cache = SummaryCache()  # 持久化 AI 摘要缓存
+# Firebase 需显式请求才返回 ETag，用于后续 If-None-Match 条件请求
+# 启用 HTTP/2（需安装 h2，即 httpx[http2]）时所有条目请求在一条长连接上多路复用，
+# per_host 即最大并发流数；未安装时记录警告并退回 HTTP/1.1 连接池
+HN_HTTP_POLICY = HttpPolicy(
+    timeout=10,
+    per_host=MAX_CONCURRENT_REQUESTS,
+    http2=True,
+    headers={"X-Firebase-ETag": "true"},
+)
+hn_validator_cache = ValidatorCache("hacker_news_http.db")
+# 本地条目存储（复用规则见 reuse_story / reuse_settled）
+HN_ITEM_MAX_AGE = 30 * 60  # 需要最新分数或 kids 的条目的最长复用时间
+HN_EDIT_WINDOW = 2 * 3600  # HN 评论发布后可编辑的时长
+HN_UPDATES_WINDOW = 5 * 60  # updates 接口只列出最近几分钟内变更的条目
+HN_STORE_RETENTION = 3 * 24 * 3600  # 条目保留期（覆盖故事在热门列表中的停留时间）
+item_store = HNItemStore(env.get_data_path("hacker_news.db"))
+# 请求限速：adaptive 按响应自动调速，初始速率取固定间隔模式的实际速率（并发数 / 平均等待 0.2 秒）；
+# conservative 为固定随机间隔（原有行为）
+HN_RATE_MODE = "adaptive"
+HN_RATE_PRESETS = {
+    "adaptive": RatePreset(
+        initial_rate=MAX_CONCURRENT_REQUESTS / 0.2, min_rate=5, max_rate=500, increase=2
+    ),
+    "conservative": RatePreset(adaptive=False, delay=(0.1, 0.3), batch_delay=(0.5, 1.0)),
+}
+hn_rate_limiter = AdaptiveRateLimiter(HN_RATE_PRESETS[HN_RATE_MODE])
 
 
 async def main_async(
@@ -436,6 +668,7 @@ async def main_async(
     stories = await collect_recent_stories_async(
         hours, max_stories, story_type, min_score
     )
+    hn_rate_limiter.log_metrics("📈 ")
     if not stories:
         logger.warning("❌ 未获取到任何故事，任务结束")
         return
@@ -0,0 +1,37 @@
+"""
+AIBase 文章解析后端基准测试（在 fixtures 页面上比较各后端单页耗时）
+用法：python Py/tests/bench_parsers.py [每页重复次数]
+fixtures 目录下的 aibase_article_*.html 均会参与测试，可放入保存的真实页面
+"""
+
+import glob
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401,E402  设置导入路径与环境变量
+
+import ai_morning_brief as brief  # noqa: E402
+
+FIXTURES = sorted(
+    glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "aibase_article_*.html"))
+)
+
+
+def main(number: int = 200) -> None:
+    backends = [name for name, (_, ok) in brief.PARSER_BACKENDS.items() if ok]
+    print(f"{'页面':<32}{'大小':>8}" + "".join(f"{name:>14}" for name in backends))
+    for path in FIXTURES:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        row = f"{os.path.basename(path):<34}{os.path.getsize(path) / 1024:>6.1f}KB"
+        for name in backends:
+            extract = brief.PARSER_BACKENDS[name][0]
+            seconds = min(timeit.repeat(lambda: extract(html), number=number, repeat=3))
+            row += f"{seconds / number * 1000:>11.3f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# 测试从仓库根目录或 Py 目录运行时都能导入 utils 包与脚本模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 导入脚本模块时需要的环境变量；本地缓存写入临时目录
+os.environ.setdefault("SCRIPT_DATA_DIR", tempfile.mkdtemp(prefix="script-data-"))
+os.environ.setdefault("AI_API_KEY", "test-api-key")
+os.environ.setdefault("AI_BASE_URL", "http://127.0.0.1:9")
@@ -0,0 +1,52 @@
+"""
+AIBase 文章解析后端一致性测试：各后端在 fixtures 页面上提取的标题、日期与正文应与 html.parser 一致
+"""
+
+import glob
+import os
+import re
+
+import pytest
+
+import ai_morning_brief as brief
+
+FIXTURES = sorted(
+    glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "aibase_article_*.html"))
+)
+BACKENDS = [name for name, (_, available) in brief.PARSER_BACKENDS.items() if available]
+
+
+def load(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_backend_matches_html_parser(path, backend):
+    html = load(path)
+    expected = [normalize(field) for field in brief._extract_fields_bs4(html)]
+    fields = [normalize(field) for field in brief.PARSER_BACKENDS[backend][0](html)]
+    assert fields == expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_content_excludes_non_text_nodes(path, backend):
+    _, _, content = brief.PARSER_BACKENDS[backend][0](load(path))
+    assert content.strip()
+    for marker in ("window.", "display:none", "document.createElement", "pixel.gif"):
+        assert marker not in content
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_parse_article_html(path):
+    article = brief._parse_article_html(load(path), 1, "https://www.aibase.com/zh/news/1")
+    assert article is not None
+    assert article.title
+    assert article.published_at is not None
+    assert len(article.content) >= 50
@@ -0,0 +1,74 @@
+"""
+weapi 加密与 utils/js_reverse/wyy_reverse.js 的一致性测试（需要 node，未安装时跳过）
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from utils import weapi
+
+JS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "utils",
+    "js_reverse",
+    "wyy_reverse.js",
+)
+
+# 固定 Math.random，使 JS 中 a(16) 生成指定的密钥
+NODE_SCRIPT = """
+const [jsPath, key, data] = process.argv.slice(1);
+const chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789";
+let i = 0;
+Math.random = () => (chars.indexOf(key[i++ % key.length]) + 0.5) / chars.length;
+const getData = require(jsPath);
+process.stdout.write(JSON.stringify(getData(JSON.parse(data))));
+"""
+
+CASES = [
+    {"phone": "13800000000", "password": "e10adc3949ba59abbe56e057f20f883e"},
+    {"limit": 200, "offset": 0, "total": True, "csrf_token": ""},
+    {"name": "中文参数", "nested": {"a": [1, 2, 3]}},
+    {},
+]
+
+
+def run_js(data: dict, key: str) -> dict:
+    result = subprocess.run(
+        ["node", "-e", NODE_SCRIPT, JS_PATH, key, json.dumps(data, ensure_ascii=False)],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=30,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="未安装 node")
+@pytest.mark.parametrize("data", CASES)
+@pytest.mark.parametrize("key", ["abcdefghijklmnop", "Z9y8X7w6V5u4T3s2"])
+def test_encrypt_matches_js(data, key):
+    expected = run_js(data, key)
+    assert weapi.encrypt(data, key) == {
+        "params": expected["encText"],
+        "encSecKey": expected["encSecKey"],
+    }
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="未安装 node")
+def test_secret_key_manager_matches_js():
+    manager = weapi.SecretKeyManager()
+    data = CASES[0]
+    result = manager.encrypt(data)
+    expected = run_js(data, manager.secret_key)
+    assert result == {"params": expected["encText"], "encSecKey": expected["encSecKey"]}
+
+
+def test_secret_key_manager_rotation():
+    manager = weapi.SecretKeyManager(max_uses=2)
+    first = manager.encrypt({})["encSecKey"]
+    assert manager.encrypt({})["encSecKey"] == first
+    assert manager.encrypt({})["encSecKey"] != first
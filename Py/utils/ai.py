@@ -0,0 +1,115 @@
+"""
+异步 AI 调用工具（AsyncOpenAI + 令牌桶限流 + 退避重试）
+"""
+
+import asyncio
+import random
+import time
+
+import httpx
+from loguru import logger
+from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI
+
+
+class TokenBucket:
+    """
+    异步令牌桶限流器，支持按 Retry-After 整体暂停
+    @param rate: 每秒补充的令牌数（即平均请求速率）
+    @param capacity: 桶容量（允许的突发请求数）
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """收到 429 时暂停发放令牌"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def async_openai_client(
+    api_key: str, base_url: str, max_connections: int = 30, timeout: float = 60
+) -> AsyncOpenAI | None:
+    """创建共享连接池的 AsyncOpenAI 客户端"""
+    try:
+        http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        return AsyncOpenAI(
+            api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0
+        )
+    except Exception as e:
+        logger.error(f"创建 AsyncOpenAI 客户端失败：{str(e)[:50]}")
+        return None
+
+
+def _retry_after(error: APIStatusError) -> float | None:
+    """读取 Retry-After 响应头（秒）"""
+    value = error.response.headers.get("retry-after", "") if error.response else ""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+async def chat_completion(
+    client: AsyncOpenAI,
+    limiter: TokenBucket,
+    payload: dict,
+    retries: int = 3,
+    label: str = "",
+) -> str | None:
+    """
+    调用聊天补全接口，限流/超时/服务端错误时退避重试
+    @return: 回复文本，重试耗尽返回 None
+    """
+    for retry in range(retries):
+        await limiter.acquire()
+        try:
+            resp = await client.chat.completions.create(**payload)
+            return resp.choices[0].message.content or ""
+        except APIStatusError as e:
+            if e.status_code == 429:
+                # 限流：优先遵循 Retry-After，并暂停整个令牌桶
+                wait = _retry_after(e) or 5 ** (retry + 1)
+                limiter.pause(wait)
+            elif e.status_code >= 500:
+                wait = 2 ** (retry + 1)
+            else:
+                logger.warning(f"{label} AI 请求失败（不重试）：{str(e)[:80]}")
+                return None
+        except (APITimeoutError, APIConnectionError):
+            wait = 3 ** (retry + 1)
+        except Exception as e:
+            wait = 2**retry
+            logger.warning(f"{label} AI 请求异常：{str(e)[:80]}")
+        if retry + 1 >= retries:
+            break
+        wait += random.uniform(0, 1)
+        logger.warning(f"{label} AI 请求重试 {retry + 1}/{retries}，{wait:.1f}秒后重试")
+        await asyncio.sleep(wait)
+    return None
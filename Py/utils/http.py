@@ -0,0 +1,436 @@
+"""
+共享 HTTP 客户端
+
+基于 httpx，同步/异步两套接口共用同一份策略：
+连接池 + keep-alive、可选 HTTP/2、按主机并发限制、超时与重试退避，
+以及可选的 ETag / Last-Modified 条件请求缓存和按主机自适应限速。
+"""
+
+import asyncio
+import importlib.util
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from utils.store import DiskCache
+
+# 需要重试的状态码
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+# HTTP/2 依赖 h2（pip3 install "httpx[http2]"）
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_http2_warned = False
+
+
+@dataclass
+class HttpPolicy:
+    """HTTP 客户端策略（超时 / 重试 / 连接池 / 并发限制）"""
+
+    timeout: float = 15  # 读写超时（秒）
+    connect_timeout: float = 5  # 建连超时（秒）
+    retries: int = 2  # 失败重试次数
+    backoff: float = 0.5  # 退避基数（秒），按 2 的指数增长
+    backoff_max: float = 10  # 单次退避上限（秒）
+    max_connections: int = 50  # 连接池总连接数
+    max_keepalive: int = 20  # 保持的空闲长连接数
+    per_host: int = 10  # 单个主机的最大并发请求数
+    http2: bool = False  # 是否启用 HTTP/2（需安装 h2）
+    verify: bool = True  # 是否校验证书
+    headers: dict[str, str] = field(default_factory=dict)
+    cookies: dict[str, str] = field(default_factory=dict)  # 客户端级 Cookie（httpx 已弃用按请求传入）
+
+    def client_kwargs(self) -> dict:
+        """生成 httpx 客户端参数"""
+        global _http2_warned
+        if self.http2 and not HTTP2_AVAILABLE and not _http2_warned:
+            _http2_warned = True
+            # 日志中的 "No module named 'h2'" 可被 Sh/dependency-check.sh 识别并自动安装
+            logger.warning(
+                "HTTP/2 不可用，已退回 HTTP/1.1：No module named 'h2'"
+                '（pip3 install "httpx[http2]"）'
+            )
+        return {
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+            ),
+            # 未安装 h2 时退回 HTTP/1.1
+            "http2": self.http2 and HTTP2_AVAILABLE,
+            "verify": self.verify,
+            "headers": self.headers,
+            "cookies": self.cookies,
+            "follow_redirects": True,
+        }
+
+    def should_retry(self, response: httpx.Response | None, error: Exception | None) -> bool:
+        """判断是否需要重试：网络异常或可重试状态码"""
+        if error is not None:
+            return isinstance(error, httpx.TransportError)
+        return response.status_code in RETRY_STATUS
+
+    def backoff_delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """计算退避时间，优先使用 Retry-After 响应头"""
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = self.backoff * (2**attempt)
+        return min(delay + random.uniform(0, delay / 2), self.backoff_max)
+
+
+@dataclass
+class RatePreset:
+    """
+    限速参数：adaptive 为 True 时按 AIMD 调速（成功且响应快时加速，被拒绝时按比例降速），
+    为 False 时每次请求前固定随机等待 delay 秒、每批之间等待 batch_delay 秒。
+    initial_rate 应不低于固定间隔模式的实际速率（约 并发数 / 平均等待秒数），只在被拒绝时降速
+    """
+
+    adaptive: bool = True
+    initial_rate: float = 2  # 初始速率（请求/秒）
+    min_rate: float = 0.5  # 最低速率
+    max_rate: float = 20  # 最高速率
+    increase: float = 0.2  # 每次快速成功后增加的速率（请求/秒），即每秒约增长 increase 比例
+    decrease: float = 0.5  # 被拒绝（429/5xx/超时）时速率乘以该系数
+    slow_threshold: float = 3  # 响应耗时超过该值（秒）时不再加速
+    delay: tuple[float, float] = (0, 0)  # 固定模式：每次请求前的随机等待区间
+    batch_delay: tuple[float, float] = (0, 0)  # 固定模式：批次间的随机等待区间
+
+
+@dataclass
+class _HostRate:
+    rate: float
+    next_at: float = 0.0
+    paused_until: float = 0.0
+    requests: int = 0
+    rejections: int = 0
+
+
+class AdaptiveRateLimiter:
+    """按主机的异步限速器，记录每个主机的当前速率、请求数与被拒绝次数"""
+
+    def __init__(self, preset: RatePreset | None = None):
+        self.preset = preset or RatePreset()
+        self._hosts: dict[str, _HostRate] = {}
+
+    def _state(self, url: str) -> _HostRate:
+        host = _host_of(url)
+        if host not in self._hosts:
+            self._hosts[host] = _HostRate(rate=self.preset.initial_rate)
+        return self._hosts[host]
+
+    async def acquire(self, url: str) -> None:
+        """等待直到该主机允许发出下一个请求"""
+        if not self.preset.adaptive:
+            await _random_sleep(self.preset.delay)
+            return
+        state = self._state(url)
+        now = time.monotonic()
+        # 事件循环单线程，预约发送时刻与更新之间无 await，无需加锁
+        slot = max(now, state.next_at, state.paused_until)
+        state.next_at = slot + 1 / state.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def record(
+        self,
+        url: str,
+        status: int | None,
+        elapsed: float,
+        retry_after: float | None = None,
+    ) -> None:
+        """
+        记录一次请求结果并调整速率
+        @param status: 响应状态码，网络异常或超时传 None
+        @param elapsed: 请求耗时（秒）
+        @param retry_after: 服务端要求的等待秒数
+        """
+        state = self._state(url)
+        state.requests += 1
+        rejected = status is None or status in RETRY_STATUS
+        state.rejections += rejected
+        if not self.preset.adaptive:
+            return
+        if rejected:
+            state.rate = max(self.preset.min_rate, state.rate * self.preset.decrease)
+            if retry_after:
+                state.paused_until = max(state.paused_until, time.monotonic() + retry_after)
+        elif elapsed <= self.preset.slow_threshold:
+            state.rate = min(self.preset.max_rate, state.rate + self.preset.increase)
+
+    async def batch_pause(self) -> None:
+        """批次间等待（仅固定模式，自适应模式由 acquire 控制节奏）"""
+        if not self.preset.adaptive:
+            await _random_sleep(self.preset.batch_delay)
+
+    def metrics(self) -> dict[str, dict[str, float | None]]:
+        """各主机的当前速率（请求/秒，固定间隔模式为 None）、请求数与被拒绝次数"""
+        return {
+            host: {
+                "rate": round(state.rate, 2) if self.preset.adaptive else None,
+                "requests": state.requests,
+                "rejections": state.rejections,
+            }
+            for host, state in self._hosts.items()
+        }
+
+    def log_metrics(self, prefix: str = "") -> None:
+        """按主机记录限速统计（各脚本统一格式）"""
+        for host, stats in self.metrics().items():
+            rate = f"{stats['rate']} 次/秒" if stats["rate"] is not None else "固定间隔"
+            logger.info(
+                f"{prefix}限速统计：{host} 当前速率 {rate}，"
+                f"请求 {stats['requests']} 次，被拒绝 {stats['rejections']} 次"
+            )
+
+
+async def _random_sleep(interval: tuple[float, float]) -> None:
+    low, high = interval
+    if high > 0:
+        await asyncio.sleep(random.uniform(low, high))
+
+
+def _retry_after_seconds(response: httpx.Response | None) -> float | None:
+    value = response.headers.get("Retry-After", "") if response is not None else ""
+    return float(value) if value.isdigit() else None
+
+
+class ValidatorCache(DiskCache):
+    """
+    条件请求缓存：按 URL 保存 ETag / Last-Modified 及响应体，304 时复用响应体
+    @param name: 缓存文件名（位于脚本数据目录）
+    @param max_entries: 最大条目数
+    @param ttl: 缓存保留时间（秒）
+    """
+
+    def __init__(self, name: str, max_entries: int = 5000, ttl: float = 7 * 24 * 3600):
+        super().__init__(name, max_entries)
+        self.ttl = ttl
+
+    def lookup(self, url: str) -> tuple[dict[str, str], str | None]:
+        """返回 (条件请求头, 已缓存响应体)，无缓存时为 ({}, None)"""
+        try:
+            hit, entry = self.get(url)
+        except Exception:
+            return {}, None
+        if not hit:
+            return {}, None
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers, entry["body"]
+
+    def store(self, url: str, headers, body: str) -> None:
+        """保存 200 响应的校验信息（响应不含 ETag / Last-Modified 时不缓存）"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        try:
+            self.set(
+                url,
+                {"etag": etag, "last_modified": last_modified, "body": body},
+                self.ttl,
+            )
+        except Exception:
+            pass  # 缓存写入失败不影响请求结果
+
+
+def _apply_validators(
+    cache: ValidatorCache | None, method: str, url: str, kwargs: dict
+) -> str | None:
+    """为 GET 请求附加条件请求头，返回已缓存的响应体"""
+    if cache is None or method.upper() != "GET":
+        return None
+    headers, body = cache.lookup(str(url))
+    if body is not None:
+        kwargs["headers"] = {**headers, **(kwargs.get("headers") or {})}
+    return body
+
+
+def _resolve_validators(
+    cache: ValidatorCache | None, url: str, response: httpx.Response, body: str | None
+) -> httpx.Response:
+    """304 时用缓存响应体构造 200 响应，200 时更新缓存"""
+    if cache is None:
+        return response
+    if response.status_code == 304 and body is not None:
+        return httpx.Response(200, text=body, request=response.request)
+    if response.status_code == 200 and response.request.method == "GET":
+        cache.store(str(url), response.headers, response.text)
+    return response
+
+
+def _host_of(url: str) -> str:
+    return urlsplit(str(url)).netloc
+
+
+class _RequestAttempts:
+    """
+    同步/异步客户端共用的请求流程：附加条件请求头、记录限速结果、判定是否重试，
+    以及结束时还原 304 响应或抛出异常；两种客户端只负责实际发送与等待
+    """
+
+    def __init__(
+        self,
+        policy: HttpPolicy,
+        validator_cache: ValidatorCache | None,
+        rate_limiter: "AdaptiveRateLimiter | None",
+        method: str,
+        url: str,
+        kwargs: dict,
+    ):
+        self.policy = policy
+        self.validator_cache = validator_cache
+        self.rate_limiter = rate_limiter
+        self.url = url
+        self.cached_body = _apply_validators(validator_cache, method, url, kwargs)
+
+    def __iter__(self):
+        return iter(range(self.policy.retries + 1))
+
+    def retry_delay(
+        self,
+        attempt: int,
+        response: httpx.Response | None,
+        error: Exception | None,
+        elapsed: float,
+    ) -> float | None:
+        """返回重试前的等待秒数，不再重试时返回 None（随后调用 finish）"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(
+                self.url,
+                response.status_code if response is not None else None,
+                elapsed,
+                _retry_after_seconds(response),
+            )
+        if attempt >= self.policy.retries or not self.policy.should_retry(response, error):
+            return None
+        return self.policy.backoff_delay(attempt, response)
+
+    def finish(self, response: httpx.Response | None, error: Exception | None) -> httpx.Response:
+        if error is not None:
+            raise error
+        return _resolve_validators(self.validator_cache, self.url, response, self.cached_body)
+
+
+class HttpClient:
+    """同步 HTTP 客户端（线程安全，可在多线程间共享），传入 validator_cache 时 GET 使用条件请求"""
+
+    def __init__(
+        self,
+        policy: HttpPolicy | None = None,
+        validator_cache: ValidatorCache | None = None,
+    ):
+        self.policy = policy or HttpPolicy()
+        self.validator_cache = validator_cache
+        self._client = httpx.Client(**self.policy.client_kwargs())
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = _host_of(url)
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.policy.per_host)
+            return self._host_limits[host]
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求，按策略重试；重试耗尽后返回最后一次响应或抛出异常"""
+        attempts = _RequestAttempts(
+            self.policy, self.validator_cache, None, method, url, kwargs
+        )
+        for attempt in attempts:
+            response, error = None, None
+            started = time.monotonic()
+            try:
+                with self._host_limit(url):
+                    response = self._client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                error = e
+            delay = attempts.retry_delay(attempt, response, error, time.monotonic() - started)
+            if delay is None:
+                return attempts.finish(response, error)
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class AsyncHttpClient:
+    """
+    异步 HTTP 客户端（需在事件循环内创建和使用），
+    传入 validator_cache 时 GET 使用条件请求，传入 rate_limiter 时按主机自适应限速
+    """
+
+    def __init__(
+        self,
+        policy: HttpPolicy | None = None,
+        validator_cache: ValidatorCache | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        self.policy = policy or HttpPolicy()
+        self.validator_cache = validator_cache
+        self.rate_limiter = rate_limiter
+        self._client = httpx.AsyncClient(**self.policy.client_kwargs())
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = _host_of(url)
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.policy.per_host)
+        return self._host_limits[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求，按策略重试；重试耗尽后返回最后一次响应或抛出异常"""
+        attempts = _RequestAttempts(
+            self.policy, self.validator_cache, self.rate_limiter, method, url, kwargs
+        )
+        for attempt in attempts:
+            response, error = None, None
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(url)
+            started = time.monotonic()
+            try:
+                async with self._host_limit(url):
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                error = e
+            delay = attempts.retry_delay(attempt, response, error, time.monotonic() - started)
+            if delay is None:
+                return attempts.finish(response, error)
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
@@ -1,29 +1,54 @@
 import os
 import sys
 import re
+import threading
 import requests
 from datetime import datetime
 from urllib.parse import quote
 
 
+# 进程内环境变量快照（环境变量名 -> 值列表），首次读取时一次性拉取
+_env_snapshot: dict[str, list[str]] | None = None
+_env_lock = threading.Lock()
+
+
+def _load_ql_snapshot() -> dict[str, list[str]] | None:
+    """一次 QLAPI 调用拉取全部已启用的环境变量，QLAPI 不可用时返回 None"""
+    try:
+        data_list = QLAPI.getEnvs({"searchValue": ""})["data"]
+    except NameError:
+        return None  # 若 QLAPI 未定义，跳过该部分
+
+    snapshot: dict[str, list[str]] = {}
+    for item in data_list:
+        if item["status"] == 0:
+            snapshot.setdefault(item["name"].upper(), []).append(item["value"])
+    return snapshot
+
+
+def invalidate_env() -> None:
+    """清空环境变量快照，下次 get_env 时重新拉取"""
+    global _env_snapshot
+    with _env_lock:
+        _env_snapshot = None
+
+
 def get_env(env_name: str) -> list[str]:
     """
     获取指定名称的环境变量值，支持从 QLAPI 或系统环境变量中提取。
     @Created by Mol on 2024/02/27
     @param env_name: 环境变量名称（不区分大小写）
-    @return: 环境变量值列表（去重、过滤空值）
+    @return: 环境变量值列表（保持原有顺序去重、过滤空值）
     """
+    global _env_snapshot
     env_name = env_name.upper()
     env_values = []
 
-    try:
-        if QLAPI.getEnvs({"searchValue": env_name})["data"]:
-            data_list = QLAPI.getEnvs({"searchValue": env_name})["data"]
-
-            env_values = [item["value"] for item in data_list if item["status"] == 0]
-            return env_values
-    except NameError:
-        pass  # 若 QLAPI 未定义，跳过该部分
+    with _env_lock:
+        if _env_snapshot is None:
+            _env_snapshot = _load_ql_snapshot() or {}
+        if _env_snapshot.get(env_name):
+            return list(_env_snapshot[env_name])
 
     raw_value = os.environ.get(env_name, "")
     if raw_value:
@@ -37,8 +62,8 @@ def get_env(env_name: str) -> list[str]:
     if "GITHUB" in os.environ:
         print("请勿使用 GitHub Action 运行此脚本，可能导致封号！\n")
 
-    # 去重 + 过滤空字符串
-    env_values = list({v.strip() for v in env_values if v.strip()})
+    # 去重（保持顺序，避免多账号序号错乱） + 过滤空字符串
+    env_values = list(dict.fromkeys(v.strip() for v in env_values if v.strip()))
 
     if os.getenv("DEBUG") == "false":
         print("my_module")
@@ -47,6 +72,19 @@ def get_env(env_name: str) -> list[str]:
     return env_values
 
 
+def get_data_path(file_name: str) -> str:
+    """
+    获取脚本本地持久化文件路径（缓存、会话等），目录不存在时自动创建
+    @param file_name: 文件名
+    @return: 文件绝对路径，目录可通过环境变量 SCRIPT_DATA_DIR 指定
+    """
+    data_dir = os.environ.get("SCRIPT_DATA_DIR") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data"
+    )
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, file_name)
+
+
 def get_ip() -> str | None:
     """
     获取当前公网 IP 地址
@@ -0,0 +1,125 @@
+"""
+本地持久化存储（SQLite）
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any
+
+import utils.pyEnv as env
+
+
+class SqliteStore:
+    """本地 SQLite 存储基类，子类通过 SCHEMA 声明表结构"""
+
+    SCHEMA = ""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # 每次操作使用独立连接，多线程使用时互不干扰
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+class DiskCache(SqliteStore):
+    """
+    带过期时间的键值缓存，超出容量时按最近访问时间淘汰（LRU）
+    @param name: 缓存文件名（位于脚本数据目录）
+    @param max_entries: 最大条目数，0 表示不限
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at);
+    """
+
+    def __init__(self, name: str, max_entries: int = 0):
+        super().__init__(env.get_data_path(name))
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        读取缓存
+        @return: (是否命中, 值)，值可以是 None（用于缓存负结果）
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            if row["expires_at"] < now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return False, None
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return True, json.loads(row["value"])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """写入缓存（值需可 JSON 序列化），并按容量淘汰最久未访问的条目"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now + ttl, now),
+            )
+            if self.max_entries:
+                conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+
+class SummaryCache(DiskCache):
+    """AI 摘要缓存，键为 (模型, 提示词版本, 输入文本 sha256)，提示词版本变化即失效"""
+
+    def __init__(
+        self,
+        name: str = "ai_summary_cache.db",
+        max_entries: int = 5000,
+        ttl: float = 30 * 24 * 3600,
+    ):
+        super().__init__(name, max_entries)
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{prompt_version}:{digest}"
+
+    def get_summary(self, model: str, prompt_version: str, text: str) -> str | None:
+        """读取摘要，未命中返回 None"""
+        try:
+            hit, summary = self.get(self.make_key(model, prompt_version, text))
+            return summary if hit else None
+        except sqlite3.Error:
+            return None
+
+    def set_summary(self, model: str, prompt_version: str, text: str, summary: str) -> None:
+        try:
+            self.set(self.make_key(model, prompt_version, text), summary, self.ttl)
+        except sqlite3.Error:
+            pass  # 缓存写入失败不影响摘要结果
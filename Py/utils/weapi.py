@@ -0,0 +1,121 @@
+"""
+网易云音乐 weapi 加密（纯 Python 实现）
+
+与 utils/js_reverse/wyy_reverse.js 中的 getData 输出一致：
+两层 AES-CBC 加密得到 params，RSA（无填充）加密随机密钥得到 encSecKey。
+"""
+
+import base64
+import json
+import secrets
+import string
+import time
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+# 与 JS 中 getData 使用的常量保持一致
+PUBLIC_EXPONENT = int("010001", 16)
+MODULUS = int(
+    "00e0b509f6259df8642dbc35662901477df22677ec152b5ff68ace615bb7b725152b3ab17a876aea8a5aa76d2e417629ec4ee341f56135fccf695280104e0312ecbda92557c93870114af6c9d05c4f7f0c3685b7a46bee255932575cce10b424d813cfe4875d3e82047b97ddef52741d546b8e289dc6935b3ece0462db0a22b8e7",
+    16,
+)
+NONCE = "0CoJUm6Qyw8W8jud"
+IV = b"0102030405060708"
+KEY_CHARS = string.ascii_letters + string.digits
+
+
+def create_secret_key(size: int = 16) -> str:
+    """
+    生成随机 AES 密钥（对应 JS 中的 a(16)）
+    @param size: 密钥长度
+    @return: 随机字符串
+    """
+    return "".join(secrets.choice(KEY_CHARS) for _ in range(size))
+
+
+def aes_encrypt(text: str, key: str) -> str:
+    """
+    AES-CBC + PKCS7 加密并输出 Base64（对应 JS 中的 b）
+    @param text: 明文
+    @param key: 16 位密钥
+    @return: Base64 密文
+    """
+    cipher = AES.new(key.encode("utf-8"), AES.MODE_CBC, IV)
+    encrypted = cipher.encrypt(pad(text.encode("utf-8"), AES.block_size))
+    return base64.b64encode(encrypted).decode("utf-8")
+
+
+def rsa_encrypt(text: str) -> str:
+    """
+    RSA 无填充加密（对应 JS 中的 c，密钥按字节倒序后参与运算）
+    @param text: 待加密的随机密钥
+    @return: 256 位十六进制字符串
+    """
+    value = int.from_bytes(text[::-1].encode("utf-8"), "big")
+    return format(pow(value, PUBLIC_EXPONENT, MODULUS), "x").zfill(256)
+
+
+def _encrypt_params(data: dict, secret_key: str) -> str:
+    text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return aes_encrypt(aes_encrypt(text, NONCE), secret_key)
+
+
+def encrypt(data: dict, secret_key: str | None = None) -> dict[str, str]:
+    """
+    生成 weapi 请求参数（对应 JS 中的 getData）
+    @param data: 请求参数
+    @param secret_key: 第二层 AES 密钥，不传则随机生成
+    @return: {"params": ..., "encSecKey": ...}
+    """
+    secret_key = secret_key or create_secret_key()
+    return {
+        "params": _encrypt_params(data, secret_key),
+        "encSecKey": rsa_encrypt(secret_key),
+    }
+
+
+class SecretKeyManager:
+    """
+    会话级密钥管理：复用第二层 AES 密钥及其 encSecKey，省去每次请求的 RSA 运算
+    @param max_uses: 密钥最多使用次数，0 表示不限
+    @param max_age: 密钥最长存活秒数，0 表示不限
+    """
+
+    def __init__(self, max_uses: int = 0, max_age: float = 0):
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.secret_key = ""
+        self.enc_sec_key = ""
+        self._uses = 0
+        self._created_at = 0.0
+
+    def _expired(self) -> bool:
+        if not self.secret_key:
+            return True
+        if self.max_uses and self._uses >= self.max_uses:
+            return True
+        if self.max_age and time.monotonic() - self._created_at >= self.max_age:
+            return True
+        return False
+
+    def rotate(self) -> None:
+        """重新生成密钥与 encSecKey"""
+        self.secret_key = create_secret_key()
+        self.enc_sec_key = rsa_encrypt(self.secret_key)
+        self._uses = 0
+        self._created_at = time.monotonic()
+
+    def encrypt(self, data: dict) -> dict[str, str]:
+        """
+        使用当前会话密钥生成 weapi 请求参数
+        @param data: 请求参数
+        @return: {"params": ..., "encSecKey": ...}
+        """
+        if self._expired():
+            self.rotate()
+        self._uses += 1
+        return {
+            "params": _encrypt_params(data, self.secret_key),
+            "encSecKey": self.enc_sec_key,
+        }
@@ -12,19 +12,29 @@ cron: 0 9,12,23 * * *
 """
 
 import json
-import os
 import re
+import contextvars
 import hashlib
+import heapq
+import time
+import threading
 import requests
-import execjs
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from operator import itemgetter
 from loguru import logger
 import utils.pyEnv as env
+import utils.weapi as weapi
+from utils.store import SqliteStore
 
 # 日志配置
+# 多账号并行时日志交错，extra["account"] 为每行加上账号前缀（见 process_user）
 logger.remove()
-logger.add(lambda msg: print(msg, end=""), format="{message}", level="INFO")
+logger.configure(extra={"account": ""})
+logger.add(
+    lambda msg: print(msg, end=""), format="{extra[account]}{message}", level="INFO"
+)
 
 # 请求头配置
 HEADERS = {
@@ -45,37 +55,193 @@ HEADERS = {
     "x-requested-with": "XMLHttpRequest",
 }
 
+# weapi 密钥轮换配置（0 表示不限，同一账号会话内复用同一 encSecKey）
+KEY_MAX_USES = 0
+KEY_MAX_AGE = 0
+
+# 音乐人数据接口（名称: (地址, 超时秒数)），并发请求
+MUSICIAN_ENDPOINTS = {
+    "info": (
+        "https://music.163.com/weapi/nmusician/entrance/user/musician/info/get",
+        10,
+    ),
+    "stats": (
+        "https://music.163.com/weapi/creator/musician/statistic/data/overview/get",
+        10,
+    ),
+    "wallet": (
+        "https://music.163.com/weapi/nmusician/workbench/creator/wallet/overview",
+        10,
+    ),
+}
+FETCH_FAILED = "获取失败"
+
+# 歌曲列表分页配置
+SONG_LIST_URL = "https://interface.music.163.com/api/push-song-advisor/open/api/data-service/advisor/real_time_song_list"
+SONG_PAGE_SIZE = 200
+SONG_PAGE_CONCURRENCY = 5  # 并发拉取页数上限，1 为顺序拉取
+SONG_PAGE_RETRIES = 2  # 单页失败重试次数
+
+# 多账号并行处理的最大线程数，1 为逐个处理
+ACCOUNT_CONCURRENCY = 5
+
+# 本地会话缓存：Cookie 验证有效期（秒），有效期内跳过 validate_cookie
+SESSION_TTL = 6 * 3600
+SESSION_DB = env.get_data_path("wyy_yyr.db")
+
+# 报告只列出播放量较上次运行有变化的歌曲（附带增量），False 为全量列出
+REPORT_CHANGED_ONLY = True
+
+# 报告歌曲排行只列出前 K 首（0 表示不限），其余汇总为一行
+REPORT_TOP_K = 50
+# 单条通知最大字符数，超出部分汇总（适配各推送渠道的消息长度限制）
+REPORT_MAX_CHARS = 4000
+REPORT_REST_RESERVE = 60  # 为汇总行预留的字符数
+
+# 单个 Session 的连接池大小（需覆盖并发请求数）
+HTTP_POOL_SIZE = max(SONG_PAGE_CONCURRENCY, len(MUSICIAN_ENDPOINTS))
+
+
+class SessionStore(SqliteStore):
+    """本地会话缓存，记录 Cookie、最近验证时间与账户 ID（歌曲列表也按账户 ID 查询）"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            phone TEXT PRIMARY KEY,
+            cookie TEXT NOT NULL,
+            validated_at REAL NOT NULL,
+            account_id INTEGER
+        );
+    """
+
+    def get(self, phone: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM sessions WHERE phone = ?", (phone,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def save(self, phone: str, cookie: str, account_id: int) -> None:
+        with self._connect() as conn:
+            # 显式列名：旧版本数据库中多余的 artist_id 列保持为空
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (phone, cookie, validated_at, account_id) "
+                "VALUES (?, ?, ?, ?)",
+                (phone, cookie, time.time(), account_id),
+            )
+
+    def delete(self, phone: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE phone = ?", (phone,))
+
+
+class SongStatsStore(SqliteStore):
+    """
+    歌曲播放量时间序列（仅追加有变化的记录），用于增量报告与趋势查询；
+    today_play_cnt 每天清零，每条记录带所属日期 day，只与同一天的记录对比
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS song_stats (
+            artist_id INTEGER NOT NULL,
+            song_id TEXT NOT NULL,
+            ts REAL NOT NULL,
+            today_play_cnt INTEGER NOT NULL,
+            yesterday_play_cnt INTEGER NOT NULL,
+            thumbnails INTEGER NOT NULL,
+            day TEXT,
+            PRIMARY KEY (artist_id, song_id, ts)
+        );
+    """
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        with self._connect() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(song_stats)")}
+            if "day" not in columns:  # 旧版本数据库补充日期列，旧记录不再参与对比
+                conn.execute("ALTER TABLE song_stats ADD COLUMN day TEXT")
+
+    def latest(self, artist_id: int, day: str) -> dict[str, int]:
+        """获取每首歌在 day 当天最近一次记录的今日播放量"""
+        with self._connect() as conn:
+            # SQLite 中 MAX() 聚合时其余列取自最大值所在行
+            rows = conn.execute(
+                "SELECT song_id, today_play_cnt, MAX(ts) FROM song_stats "
+                "WHERE artist_id = ? AND day = ? GROUP BY song_id",
+                (artist_id, day),
+            ).fetchall()
+        return {row["song_id"]: row["today_play_cnt"] for row in rows}
+
+    def append(self, artist_id: int, songs: list[dict], ts: float, day: str) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO song_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        artist_id,
+                        get_song_key(song),
+                        ts,
+                        song["today_play_cnt"],
+                        song["yesterday_play_cnt"],
+                        song["thumbnails"],
+                        day,
+                    )
+                    for song in songs
+                ],
+            )
+
+    def trend(self, artist_id: int, song_id: str, since: float = 0) -> list[dict]:
+        """查询单首歌的播放量变化记录（无需网络请求）"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ts, day, today_play_cnt, yesterday_play_cnt, thumbnails "
+                "FROM song_stats WHERE artist_id = ? AND song_id = ? AND ts >= ? "
+                "ORDER BY ts",
+                (artist_id, str(song_id), since),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+session_store = SessionStore(SESSION_DB)
+song_stats_store = SongStatsStore(SESSION_DB)
+
+# 待写回 QingLong 的 Cookie 变更（手机号 -> 环境变量值），运行结束后统一更新
+_pending_env_updates: dict[str, str] = {}
+_env_updates_lock = threading.Lock()
 
-def compile_js(js_path: str) -> any:
-    """编译 JavaScript 加密文件"""
-    try:
-        with open(js_path, "r", encoding="utf-8") as f:
-            js_content = f.read()
-        return execjs.compile(js_content)
-    except Exception as e:
-        logger.error(f"加载 JavaScript 文件失败: {e}")
-        raise
 
+class CookieExpiredError(Exception):
+    """Cookie 已失效（接口返回 301）"""
 
-def get_encrypted_data(js_compiled: any, params: dict[str, str]) -> dict[str, str]:
+
+def create_key_manager() -> weapi.SecretKeyManager:
+    """创建会话级 weapi 密钥管理器（每个账号一个）"""
+    return weapi.SecretKeyManager(max_uses=KEY_MAX_USES, max_age=KEY_MAX_AGE)
+
+
+def get_encrypted_data(
+    key_manager: weapi.SecretKeyManager, params: dict[str, str]
+) -> dict[str, str]:
     """生成加密请求参数"""
     try:
-        result = js_compiled.call("getData", params)
-        return {"params": result["encText"], "encSecKey": result["encSecKey"]}
+        return key_manager.encrypt(params)
     except Exception as e:
-        logger.error(f"执行 JavaScript 加密失败: {e}")
+        logger.error(f"weapi 加密失败: {e}")
         raise
 
 
 def create_session(cookies: str) -> requests.Session:
-    """创建带 Cookie 的 Session"""
+    """创建带 Cookie 的 Session（连接池供并发请求复用长连接）"""
     session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     session.headers.update(HEADERS)
     session.headers.update({"cookie": cookies})
     return session
 
 
-def login_user(js_compiled: any, phone: str, password: str) -> str:
+def login_user(key_manager: weapi.SecretKeyManager, phone: str, password: str) -> str:
     """用户登录获取 Cookie"""
     try:
         # 密码使用MD5加密
@@ -87,7 +253,7 @@ def login_user(js_compiled: any, phone: str, password: str) -> str:
             "password": encrypted_pwd,
             "rememberLogin": "true",
         }
-        encrypted_data = get_encrypted_data(js_compiled, login_params)
+        encrypted_data = get_encrypted_data(key_manager, login_params)
 
         # 发送登录请求
         response = requests.post(
@@ -113,7 +279,9 @@ def login_user(js_compiled: any, phone: str, password: str) -> str:
         raise
 
 
-def get_account_info(session: requests.Session, js_compiled: any) -> int:
+def get_account_info(
+    session: requests.Session, key_manager: weapi.SecretKeyManager
+) -> int:
     """获取用户账号信息"""
     try:
         # 获取CSRF token
@@ -122,7 +290,7 @@ def get_account_info(session: requests.Session, js_compiled: any) -> int:
             raise ValueError("未找到CSRF token")
 
         params = {"csrf_token": csrf_token.group(1)}
-        encrypted_data = get_encrypted_data(js_compiled, params)
+        encrypted_data = get_encrypted_data(key_manager, params)
 
         # 获取账户信息
         response = session.post(
@@ -143,8 +311,20 @@ def get_account_info(session: requests.Session, js_compiled: any) -> int:
         raise
 
 
+def post_musician_endpoint(
+    session: requests.Session, url: str, encrypted_data: dict, timeout: float
+) -> dict[str, any]:
+    """请求单个音乐人数据接口，返回 data 字段"""
+    response = session.post(url, data=encrypted_data, timeout=timeout)
+    response.raise_for_status()
+    result = response.json()
+    if result.get("code") == 301:
+        raise CookieExpiredError("Cookie 已失效（301）")
+    return result.get("data", {}) or {}
+
+
 def get_musician_data(
-    session: requests.Session, js_compiled: any, account_id: int
+    session: requests.Session, key_manager: weapi.SecretKeyManager, account_id: int
 ) -> dict[str, any]:
     """获取音乐人数据"""
     try:
@@ -160,49 +340,53 @@ def get_musician_data(
             "targetIdType": "artistId",
             "csrf_token": csrf_token.group(1),
         }
-        encrypted_data = get_encrypted_data(js_compiled, id_trans_params)
+        encrypted_data = get_encrypted_data(key_manager, id_trans_params)
 
         session.post(
             "https://interface.music.163.com/weapi/push-song-advisor/open/api/id/trans",
             data=encrypted_data,
         )
 
-        # 获取音乐人信息
+        # 音乐人信息、统计数据、收入数据互不依赖，并发请求
         params = {"csrf_token": csrf_token.group(1)}
-        encrypted_data = get_encrypted_data(js_compiled, params)
-
-        response = session.post(
-            "https://music.163.com/weapi/nmusician/entrance/user/musician/info/get",
-            data=encrypted_data,
-        )
-        response.raise_for_status()
-
-        musician_info = response.json()
-        artist_name = musician_info.get("data", {}).get("artistName", "未知艺术家")
+        encrypted_data = get_encrypted_data(key_manager, params)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(MUSICIAN_ENDPOINTS)) as executor:
+            futures = {
+                name: executor.submit(
+                    post_musician_endpoint, session, url, encrypted_data, timeout
+                )
+                for name, (url, timeout) in MUSICIAN_ENDPOINTS.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except CookieExpiredError:
+                    raise  # Cookie 失效时其余接口同样不可用，交给调用方重新登录
+                except Exception as e:
+                    logger.warning(f"获取音乐人 {name} 数据失败: {str(e)}")
+
+        if not results:
+            raise Exception("音乐人接口全部请求失败")
+
+        # 单个接口失败时保留其余数据，失败项在报告中标记
+        info = results.get("info", {})
+        artist_name = info.get("artistName", "未知艺术家")
         logger.info(f"音乐人名称: {artist_name}")
 
-        # 获取统计数据
-        response = session.post(
-            "https://music.163.com/weapi/creator/musician/statistic/data/overview/get",
-            data=encrypted_data,
-        )
-        response.raise_for_status()
-
-        stats = response.json()
-        daily_play = stats.get("data", {}).get("playCount", 0)
-        total_play = stats.get("data", {}).get("totalPlayCount", 0)
+        if "stats" in results:
+            daily_play = results["stats"].get("playCount", 0)
+            total_play = results["stats"].get("totalPlayCount", 0)
+        else:
+            daily_play = total_play = FETCH_FAILED
         logger.info(f"昨日播放: {daily_play}, 总播放: {total_play}")
 
-        # 获取收入数据
-        response = session.post(
-            "https://music.163.com/weapi/nmusician/workbench/creator/wallet/overview",
-            data=encrypted_data,
-        )
-        response.raise_for_status()
-
-        income = response.json()
-        monthly_income = income.get("data", {}).get("monthAmount", 0)
-        daily_income = income.get("data", {}).get("dailyAmount", 0)
+        if "wallet" in results:
+            monthly_income = results["wallet"].get("monthAmount", 0)
+            daily_income = results["wallet"].get("dailyAmount", 0)
+        else:
+            monthly_income = daily_income = FETCH_FAILED
         logger.info(f"月收入: {monthly_income}, 日收入: {daily_income}")
 
         return {
@@ -218,6 +402,49 @@ def get_musician_data(
         raise
 
 
+def fetch_song_page(
+    session: requests.Session, json_data: dict, page_num: int
+) -> dict[str, any]:
+    """获取单页歌曲数据（失败时仅重试当前页）"""
+    payload = {**json_data, "page_num": page_num}
+    for retry in range(SONG_PAGE_RETRIES + 1):
+        try:
+            response = session.post(SONG_LIST_URL, json=payload)
+            response.raise_for_status()
+            return response.json().get("data", {})
+        except Exception as e:
+            if retry >= SONG_PAGE_RETRIES:
+                raise
+            logger.warning(
+                f"获取第 {page_num} 页歌曲失败（重试 {retry + 1}/{SONG_PAGE_RETRIES}）: {e}"
+            )
+            time.sleep(2**retry)
+
+
+def iter_song_pages(session: requests.Session, json_data: dict):
+    """按页码顺序产出歌曲列表，第 2 页起并发拉取"""
+    first_page = fetch_song_page(session, json_data, 1)
+    yield first_page.get("data", [])
+
+    total_num = first_page.get("total_num", 0)
+    total_pages = (total_num + SONG_PAGE_SIZE - 1) // SONG_PAGE_SIZE
+    if total_pages <= 1:
+        return
+
+    # executor.map 按提交顺序返回结果，保证合并时页序不变
+    # 工作线程不继承调用方的 contextvars，逐页复制上下文以保留日志账号前缀
+    ctx = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=SONG_PAGE_CONCURRENCY) as executor:
+        pages = executor.map(
+            lambda page_num: ctx.copy().run(
+                fetch_song_page, session, json_data, page_num
+            ),
+            range(2, total_pages + 1),
+        )
+        for page in pages:
+            yield page.get("data", [])
+
+
 def get_song_data(session: requests.Session, artist_id: int) -> dict[str, any]:
     """获取歌曲数据"""
     try:
@@ -230,61 +457,36 @@ def get_song_data(session: requests.Session, artist_id: int) -> dict[str, any]:
             "page_num": 1,
             "artist_id": artist_id,
             "dt": yesterday.strftime("%Y-%m-%d"),
-            "page_size": 200,
+            "page_size": SONG_PAGE_SIZE,
             "order_field": "today_play_cnt",
             "order_direction": "desc",
             "use_total_num": 1,
         }
-
-        # 发送请求
         session.headers.update({"content-type": "application/json"})
-        response = session.post(
-            "https://interface.music.163.com/api/push-song-advisor/open/api/data-service/advisor/real_time_song_list",
-            json=json_data,
-        )
-        response.raise_for_status()
-
-        data = response.json().get("data", {})
-        total_num = data.get("total_num", 0)
-        all_songs = data.get("data", [])
-
-        # 计算总页数
-        page_size = 200
-        total_pages = (total_num + page_size - 1) // page_size
 
-        # 获取所有页面数据
-        for page_num in range(2, total_pages + 1):
-            json_data["page_num"] = page_num
-            response = session.post(
-                "https://interface.music.163.com/api/push-song-advisor/open/api/data-service/advisor/real_time_song_list",
-                json=json_data,
-            )
-            response.raise_for_status()
-            page_data = response.json().get("data", {}).get("data", [])
-            all_songs.extend(page_data)
-        # 输出每首歌曲的今日播放量
-        for song in all_songs:
-            song["today_play_cnt"] = song.get("today_play_cnt", 0)
-            song["yesterday_play_cnt"] = song.get("yesterday_play_cnt", 0)
-            song["thumbnails"] = song.get("thumbnails", 0)
-            # 打印具体信息
-            logger.info(
-                f"歌曲: {song.get('song_name', '未知歌曲')}, "
-                f"今日播放: {song.get('today_play_cnt', 0)}, "
-                f"昨日播放: {song.get('yesterday_play_cnt', 0)}, "
-                f"实时数据: {song.get('thumbnails', 0)}"
-            )
-        # 计算总播放量
-        today_play_total = sum(song.get("today_play_cnt", 0) for song in all_songs)
-        logger.info(f"歌曲总数: {len(all_songs)}, 今日播放总量: {today_play_total}")
-
-        # 按播放量排序
-        sorted_songs = sorted(all_songs, key=itemgetter("today_play_cnt"), reverse=True)
+        # 边拉取边统计，只保留一份歌曲列表
+        songs = []
+        today_play_total = 0
+        for page_songs in iter_song_pages(session, json_data):
+            for song in page_songs:
+                song["today_play_cnt"] = song.get("today_play_cnt", 0)
+                song["yesterday_play_cnt"] = song.get("yesterday_play_cnt", 0)
+                song["thumbnails"] = song.get("thumbnails", 0)
+                # 逐首明细仅在 DEBUG 级别输出，避免多账号并行时刷屏
+                logger.debug(
+                    f"歌曲: {song.get('song_name', '未知歌曲')}, "
+                    f"今日播放: {song['today_play_cnt']}, "
+                    f"昨日播放: {song['yesterday_play_cnt']}, "
+                    f"实时数据: {song['thumbnails']}"
+                )
+                today_play_total += song["today_play_cnt"]
+            songs.extend(page_songs)
+        logger.info(f"歌曲总数: {len(songs)}, 今日播放总量: {today_play_total}")
 
         return {
-            "total_songs": len(all_songs),
+            "total_songs": len(songs),
             "today_play_total": today_play_total,
-            "songs": sorted_songs,
+            "songs": songs,
         }
 
     except Exception as e:
@@ -292,6 +494,54 @@ def get_song_data(session: requests.Session, artist_id: int) -> dict[str, any]:
         raise
 
 
+def get_song_key(song: dict) -> str:
+    """歌曲唯一标识（优先使用 song_id）"""
+    return str(song.get("song_id") or song.get("song_name", ""))
+
+
+def diff_song_stats(artist_id: int, song_data: dict) -> dict[str, any]:
+    """
+    对比当天上次运行的播放量，记录并返回有变化的歌曲（附带 play_delta）；
+    今日播放量每天清零，当天首次运行没有可对比的记录，作为基线记录全部歌曲并全量报告
+    """
+    try:
+        day = datetime.now().strftime("%Y-%m-%d")
+        last_counts = song_stats_store.latest(artist_id, day)
+        if not last_counts:
+            song_stats_store.append(artist_id, song_data["songs"], time.time(), day)
+            logger.info(f"当天首次运行，记录 {song_data['total_songs']} 首歌曲作为对比基线")
+            return song_data
+
+        changed_songs = []
+        for song in song_data["songs"]:
+            last = last_counts.get(get_song_key(song))
+            if last == song["today_play_cnt"]:
+                continue
+            song["play_delta"] = None if last is None else song["today_play_cnt"] - last
+            changed_songs.append(song)
+
+        song_stats_store.append(artist_id, changed_songs, time.time(), day)
+        logger.info(f"播放量有变化的歌曲: {len(changed_songs)}/{song_data['total_songs']}")
+        return {**song_data, "songs": changed_songs, "changed_only": True}
+    except Exception as e:
+        # 本地存储异常时退回全量报告
+        logger.error(f"歌曲播放量对比失败: {str(e)}")
+        return song_data
+
+
+def play_delta_key(song: dict) -> int:
+    """播放增量排序键：当天新出现的歌曲以今日播放量计"""
+    delta = song.get("play_delta")
+    return song["today_play_cnt"] if delta is None else delta
+
+
+def rank_songs(songs: list[dict], top_k: int, key=itemgetter("today_play_cnt")) -> list[dict]:
+    """按 key（默认今日播放量）取前 K 首（堆选择，K<=0 时全量排序）"""
+    if 0 < top_k < len(songs):
+        return heapq.nlargest(top_k, songs, key=key)
+    return sorted(songs, key=key, reverse=True)
+
+
 def format_report(
     user_index: int, account_id: int, musician_data: dict, song_data: dict
 ) -> str:
@@ -306,19 +556,41 @@ def format_report(
         f"日收入: {musician_data['daily_income']}",
         f"歌曲总数: {song_data['total_songs']}",
         f"今日播放总量: {song_data['today_play_total']}",
-        "",
-        "歌曲播放排行:",
     ]
-
-    # 添加歌曲信息
-    for i, song in enumerate(song_data["songs"], 1):
+    if song_data.get("changed_only"):
+        report += [f"播放量变化歌曲: {len(song_data['songs'])}", "", "播放变化排行:"]
+        rank_key = play_delta_key
+    else:
+        report += ["", "歌曲播放排行:"]
+        rank_key = itemgetter("today_play_cnt")
+
+    # 添加歌曲信息（前 K 名，超出通知长度上限的部分汇总为一行）
+    songs = song_data["songs"]
+    ranked = rank_songs(songs, REPORT_TOP_K, rank_key)
+    length = sum(len(line) + 1 for line in report)
+    shown = shown_play = 0
+    for i, song in enumerate(ranked, 1):
+        delta = song.get("play_delta", "")
+        if delta is None:
+            delta = " (新)"
+        elif delta != "":
+            delta = f" ({delta:+d})"
         song_info = (
             f"{i}. {song.get('song_name', '未知歌曲')}: "
-            f"今日播放 {song.get('today_play_cnt', 0)}, "
+            f"今日播放 {song.get('today_play_cnt', 0)}{delta}, "
             f"昨日播放 {song.get('yesterday_play_cnt', 0)}, "
             f"实时数据 {song.get('thumbnails', 0)}"
         )
+        if length + len(song_info) + 1 > REPORT_MAX_CHARS - REPORT_REST_RESERVE:
+            break
         report.append(song_info)
+        length += len(song_info) + 1
+        shown += 1
+        shown_play += song.get("today_play_cnt", 0)
+
+    if shown < len(songs):
+        rest_play = sum(song.get("today_play_cnt", 0) for song in songs) - shown_play
+        report.append(f"... 其余 {len(songs) - shown} 首歌曲，今日播放合计 {rest_play}")
 
     return "\n".join(report)
 
@@ -333,59 +605,96 @@ def validate_cookie(session: requests.Session) -> bool:
     except Exception as e:
         logger.error(f"验证 Cookie 失败: {str(e)}")
         return False
-def process_user(js_compiled: any, user_cred: str, index: int):
-    """处理单个用户"""
+def refresh_cookie(
+    key_manager: weapi.SecretKeyManager, phone: str, password: str, cookie: str
+) -> str:
+    """验证 Cookie，为空或已失效时重新登录，返回可用的 Cookie"""
+    if cookie:
+        if validate_cookie(create_session(cookie)):
+            logger.info(f"用户 {phone} 的 Cookie 仍然有效，跳过登录")
+            return cookie
+        logger.warning(f"用户 {phone} 的 Cookie 已过期，正在重新登录...")
+    return login_user(key_manager, phone, password)
+
+
+def queue_env_update(phone: str, password: str, env_cookie: str, cookie: str) -> None:
+    """只有在 Cookie 发生变化时才更新 QingLong 环境变量（运行结束后统一写入）"""
+    if cookie != env_cookie:
+        with _env_updates_lock:
+            _pending_env_updates[phone] = f"{phone}:{password}:{cookie}"
+
+
+def process_user(user_cred: str, index: int):
+    """处理单个用户，本账号的日志统一带上 [#序号] 前缀"""
+    with logger.contextualize(account=f"[#{index}] "):
+        return _process_user(user_cred, index)
+
+
+def _process_user(user_cred: str, index: int):
+    phone = ""
     try:
         # 分割用户凭证
         if ":" not in user_cred:
             raise ValueError("用户凭证格式错误，应为 '手机号:密码:cookie'")
         parts = user_cred.split(":", 2)
-        cookie = parts[2] if len(parts) > 2 else ""  # 分割成最多3部分
+        env_cookie = parts[2] if len(parts) > 2 else ""  # 分割成最多3部分
         phone = parts[0]
         password = parts[1]
         logger.info(f"处理用户 ########{index}: {phone}")
 
-        # 登录获取Cookie（如果cookie为空，则调用登录接口）
-        if cookie:
-            session = create_session(cookie)
-            if validate_cookie(session):
-                logger.info(f"用户 {phone} 的 Cookie 仍然有效，跳过登录")
-                cookie_str = cookie
-            else:
-                logger.warning(f"用户 {phone} 的 Cookie 已过期，正在重新登录...")
-                cookie_str = login_user(js_compiled, phone, password)
+        # 每个账号会话共用一组 weapi 密钥
+        key_manager = create_key_manager()
+
+        # 本地会话缓存：TTL 内验证过的 Cookie 跳过验证，并复用账户 ID
+        cookie = env_cookie
+        record = session_store.get(phone)
+        if record and (not cookie or cookie == record["cookie"]):
+            cookie = record["cookie"]
         else:
-            cookie_str = login_user(js_compiled, phone, password)
+            record = None
+        fresh = bool(record) and time.time() - record["validated_at"] < SESSION_TTL
 
-        # 只有在 Cookie 发生变化时才更新 QingLong 环境变量
-        if not cookie or cookie_str != cookie:
-            all_user = QLAPI.getEnvs({"searchValue": "WYY_YYR"})["data"]
-            for user in all_user:
-                if user["value"].find(phone) != -1:
-                    logger.info(f"{phone}:{password}:{cookie_str}")
-                    QLAPI.updateEnv(
-                        {
-                            "env": {
-                                "id": user["id"],
-                                "value": f"{phone}:{password}:{cookie_str}",
-                            }
-                        }
-                    )
-                    logger.info(f"更新用户:{phone}成功")
-                    break
+        # 登录获取Cookie（如果cookie为空，则调用登录接口）
+        if fresh:
+            logger.info(f"用户 {phone} 的 Cookie 在缓存有效期内，跳过验证")
+            cookie_str = cookie
+        else:
+            cookie_str = refresh_cookie(key_manager, phone, password, cookie)
+        queue_env_update(phone, password, env_cookie, cookie_str)
 
         # 创建Session
         session = create_session(cookie_str)
 
-        # 获取账户信息
-        account_id = get_account_info(session, js_compiled)
-
-        # 获取音乐人数据
-        musician_data = get_musician_data(session, js_compiled, account_id)
+        # 获取账户信息（缓存有效时直接复用）
+        if fresh and record["account_id"]:
+            account_id = record["account_id"]
+            logger.info(f"当前用户 ID: {account_id}（缓存）")
+        else:
+            account_id = get_account_info(session, key_manager)
+
+        # 获取音乐人数据（缓存的 Cookie 可能在有效期内被注销，失效时本次运行内重新验证或登录）
+        try:
+            musician_data = get_musician_data(session, key_manager, account_id)
+        except CookieExpiredError:
+            if not fresh:
+                raise
+            logger.warning(f"用户 {phone} 缓存的 Cookie 已失效，重新验证...")
+            cookie_str = refresh_cookie(key_manager, phone, password, cookie_str)
+            queue_env_update(phone, password, env_cookie, cookie_str)
+            session = create_session(cookie_str)
+            account_id = get_account_info(session, key_manager)
+            musician_data = get_musician_data(session, key_manager, account_id)
+
+        # 音乐人接口请求成功即说明 Cookie 有效，刷新本地会话缓存
+        session_store.save(phone, cookie_str, account_id)
 
         # 获取歌曲数据
         song_data = get_song_data(session, account_id)
 
+        # 仅报告与上次运行相比播放量有变化的歌曲
+        if REPORT_CHANGED_ONLY:
+            song_data = diff_song_stats(account_id, song_data)
+
         # 生成报告
         report = format_report(index, account_id, musician_data, song_data)
 
@@ -395,19 +704,33 @@ def process_user(js_compiled: any, user_cred: str, index: int):
         return True
     except Exception as e:
         logger.error(f"处理用户 #{index} 失败: {str(e)}")
+        # 缓存的 Cookie 可能已失效，下次运行重新验证
+        if phone:
+            session_store.delete(phone)
         return False
 
 
-def main():
-    """主函数"""
+def flush_env_updates() -> None:
+    """批量写回变更的 Cookie 到 QingLong 环境变量（只查询一次环境变量列表）"""
+    if not _pending_env_updates:
+        return
     try:
-        # 获取脚本目录
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        js_path = os.path.join(script_dir, "./utils/js_reverse/wyy_reverse.js")
+        all_user = QLAPI.getEnvs({"searchValue": "WYY_YYR"})["data"]
+        for phone, value in _pending_env_updates.items():
+            for user in all_user:
+                if user["value"].find(phone) != -1:
+                    QLAPI.updateEnv({"env": {"id": user["id"], "value": value}})
+                    logger.info(f"更新用户:{phone}成功")
+                    break
+        _pending_env_updates.clear()
+        env.invalidate_env()
+    except Exception as e:
+        logger.error(f"更新环境变量失败: {str(e)}")
 
-        # 加载JS加密模块
-        js_compiled = compile_js(js_path)
 
+def main():
+    """主函数"""
+    try:
         # 获取用户凭证
         user_creds = env.get_env("WYY_YYR")
         if not user_creds:
@@ -416,13 +739,20 @@ def main():
 
         logger.info(f"找到 {len(user_creds)} 个用户")
 
-        # 处理每个用户
-        success_count = 0
-        for i, cred in enumerate(user_creds, 1):
-            if process_user(js_compiled, cred, i):
-                success_count += 1
+        # 多账号并行处理，每个账号使用独立的 Session 与密钥
+        with ThreadPoolExecutor(max_workers=ACCOUNT_CONCURRENCY) as executor:
+            results = list(
+                executor.map(process_user, user_creds, range(1, len(user_creds) + 1))
+            )
+
+        # 统一写回变更的 Cookie
+        flush_env_updates()
 
+        success_count = sum(results)
+        failed = [str(i) for i, ok in enumerate(results, 1) if not ok]
         logger.info(f"处理完成: 成功 {success_count}/{len(user_creds)} 个用户")
+        if failed:
+            logger.warning(f"处理失败的用户: #{', #'.join(failed)}")
     except Exception as e:
         logger.error(f"程序执行失败: {str(e)}")
 
@@ -78,6 +78,8 @@ check_ip_location() {
 # Python包名映射（日志包名 -> 实际安装包名）
 declare -A PYTHON_PACKAGE_MAP=(
     ["execjs"]="PyExecJS"
+    ["Crypto"]="pycryptodome"
+    ["h2"]="httpx[http2]"
     ["cv2"]="opencv-python"
     ["PIL"]="Pillow"
     ["sklearn"]="scikit-learn"